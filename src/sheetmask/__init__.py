@@ -1,3 +1,16 @@
-from sheetmask.rules import PercentageVarianceRule, PreserveRelationshipRule
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from sheetmask.rules import PercentageVarianceRule, PreserveRelationshipRule
 
 __all__ = ["PercentageVarianceRule", "PreserveRelationshipRule"]
+
+
+def __getattr__(name: str):
+    # Import the rules (and pandas with them) on first use, so the CLI can
+    # start and print --help without loading pandas
+    if name in __all__:
+        from sheetmask import rules  # pylint: disable=import-outside-toplevel
+
+        return getattr(rules, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -10,10 +10,14 @@ import pandas as pd
 from pathlib import Path
 from rich.console import Console
 
+from sheetmask.excel_io import open_workbook, read_sheet_head
 from sheetmask.filename_parser import parse_date_from_filename
 
 console = Console()
 
+# Minimum rows read per sheet; column stats beyond this are sampled
+HEAD_ROWS = 1000
+
 
 def analyze_excel_for_anonymization(
     input_path: Path,
@@ -31,78 +35,67 @@ def analyze_excel_for_anonymization(
     Returns:
         LLM prompt ready to paste into Claude/GPT
     """
-    # Read Excel file - get all sheet names
-    xls = pd.ExcelFile(input_path)
-
-    if sheet_name:
-        # Analyze single sheet
-        sheets_to_analyze = {
-            sheet_name: pd.read_excel(input_path, sheet_name=sheet_name)
-        }
-    else:
-        # Analyze ALL sheets
-        sheets_to_analyze = {
-            name: pd.read_excel(input_path, sheet_name=name) for name in xls.sheet_names
-        }
+    # Open the workbook once; every sheet read reuses the handle
+    with open_workbook(input_path) as xls:
+        sheet_names = [sheet_name] if sheet_name else xls.sheet_names
+
+        # Only a head of each sheet is needed for dtypes, stats and samples;
+        # the full row count comes from sheet metadata
+        head_rows = max(HEAD_ROWS, sample_rows * 100)
+        sheets_to_analyze = {}
+        row_counts = {}
+        for name in sheet_names:
+            sheets_to_analyze[name], row_counts[name] = read_sheet_head(
+                xls, name, head_rows
+            )
 
     # Parse date from filename
     date_result = parse_date_from_filename(input_path.name)
 
     # Build prompt header
     total_sheets = len(sheets_to_analyze)
-    total_rows = sum(len(df) for df in sheets_to_analyze.values())
+    total_rows = sum(row_counts.values())
 
-    prompt = f"""# Excel Column Analysis for Anonymization
+    parts = [f"""# Excel Column Analysis for Anonymization
 
 ## Task
 Analyze the columns in this Excel file and recommend anonymization strategies.
 
 ## File Information
 - **File**: {input_path.name}
-"""
+"""]
 
     # Add parsed date if found
     if date_result.date:
-        prompt += f"- **Parsed Date**: {date_result.date.strftime('%Y-%m-%d')} (Confidence: {date_result.confidence})\n"
-        prompt += f"- **Date Pattern**: {date_result.pattern}\n"
+        parts.append(
+            f"- **Parsed Date**: {date_result.date.strftime('%Y-%m-%d')} (Confidence: {date_result.confidence})\n"
+        )
+        parts.append(f"- **Date Pattern**: {date_result.pattern}\n")
 
-    prompt += f"""- **Total Sheets**: {total_sheets}
+    parts.append(f"""- **Total Sheets**: {total_sheets}
 - **Total Rows**: {total_rows:,}
 
 ## Sheet Overview
 
-"""
+""")
 
     # Add sheet overview
     for name, df in sheets_to_analyze.items():
-        prompt += f"### {name}\n"
-        prompt += f"- **Rows**: {len(df):,}\n"
-        prompt += f"- **Columns**: {len(df.columns)}\n\n"
+        parts.append(f"### {name}\n")
+        parts.append(f"- **Rows**: {row_counts[name]:,}\n")
+        parts.append(f"- **Columns**: {len(df.columns)}\n\n")
 
     # Analyze each sheet in detail
     for sheet_name, df in sheets_to_analyze.items():
-        prompt += f"\n---\n\n## Sheet: {sheet_name}\n\n"
-        prompt += f"**Rows**: {len(df):,} | **Columns**: {len(df.columns)}\n\n"
-        prompt += (
-            "| Column Name | Data Type | Sample Values | Null % | Unique Count |\n"
+        parts.append(f"\n---\n\n## Sheet: {sheet_name}\n\n")
+        parts.append(
+            f"**Rows**: {row_counts[sheet_name]:,} | **Columns**: {len(df.columns)}\n\n"
         )
-        prompt += (
-            "|-------------|-----------|---------------|--------|--------------|\n"
-        )
-
-        # Analyze each column
-        for col in df.columns:
-            dtype = str(df[col].dtype)
-            null_pct = (df[col].isna().sum() / len(df)) * 100
-            unique_count = df[col].nunique()
-
-            # Get sample values (truncate long strings)
-            samples = df[col].dropna().head(sample_rows).tolist()
-            sample_str = ", ".join(str(s)[:30] for s in samples)
-            if not sample_str:
-                sample_str = "(all null)"
-
-            prompt += f"| {col} | {dtype} | {sample_str} | {null_pct:.1f}% | {unique_count} |\n"
+        if len(df) < row_counts[sheet_name]:
+            parts.append(
+                f"*Null % and Unique Count sampled from the first {len(df):,} rows.*\n\n"
+            )
+        parts.append(_column_table(df, sample_rows))
 
     sheet_list = list(sheets_to_analyze.keys())
     sheets_example = (
@@ -111,7 +104,7 @@ Analyze the columns in this Excel file and recommend anonymization strategies.
         else f'["{sheet_list[0]}", "{sheet_list[1] if len(sheet_list) > 1 else sheet_list[0]}"]'
     )
 
-    prompt += f"""
+    parts.append(f"""
 
 ---
 
@@ -220,6 +213,31 @@ sheetmask process your_file.xlsx --config my_config.py
 4. **Provide complete config** in the format above
 
 Please analyze and provide recommendations.
-"""
-
-    return prompt
+""")
+
+    return "".join(parts)
+
+
+def _column_table(df: pd.DataFrame, sample_rows: int) -> str:
+    """Markdown table of per-column dtype, samples, null % and unique count"""
+    # Column stats for the whole frame in one vectorised pass each
+    null_pcts = df.isna().mean() * 100
+    unique_counts = df.nunique()
+
+    rows = [
+        "| Column Name | Data Type | Sample Values | Null % | Unique Count |\n",
+        "|-------------|-----------|---------------|--------|--------------|\n",
+    ]
+    # Samples almost always come from the first rows; only scan a column
+    # further when its head is too sparse
+    head = df.head(max(50, sample_rows * 10))
+    for col, dtype in df.dtypes.items():
+        # Get sample values (truncate long strings)
+        samples = head[col].dropna().head(sample_rows).tolist()
+        if len(samples) < sample_rows:
+            samples = df[col].dropna().head(sample_rows).tolist()
+        sample_str = ", ".join(str(s)[:30] for s in samples) or "(all null)"
+        rows.append(
+            f"| {col} | {dtype} | {sample_str} | {null_pcts[col]:.1f}% | {unique_counts[col]} |\n"
+        )
+    return "".join(rows)
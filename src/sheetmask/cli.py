@@ -11,9 +11,9 @@ import importlib.util
 import typer
 from pathlib import Path
 from rich.console import Console
-from sheetmask.analyzer import analyze_excel_for_anonymization
-from sheetmask.multi_analyzer import analyze_multiple_files
-from sheetmask.executor import AnonymizationExecutor
+
+# Commands import the analyzers/executor on demand: they pull in pandas,
+# which would otherwise slow down every invocation, including --help
 
 app = typer.Typer(
     name="sheetmask",
@@ -60,6 +60,9 @@ def analyze(
         4. sheetmask process input.xlsx --config config.py
     """
 
+    # pylint: disable=import-outside-toplevel
+    from sheetmask.analyzer import analyze_excel_for_anonymization
+
     try:
         console.print("[cyan]Analyzing Excel file...[/cyan]\n")
         prompt = analyze_excel_for_anonymization(input_file, sheet_name=sheet)
@@ -109,6 +112,9 @@ def analyze_multi(
     writing an anonymization config.
     """
 
+    # pylint: disable=import-outside-toplevel
+    from sheetmask.multi_analyzer import analyze_multiple_files
+
     try:
         if len(input_files) < 2:
             msg = "[yellow]Warning: Only 1 file provided. Works best with 2+ files.[/yellow]"
@@ -178,25 +184,11 @@ def process(
     """
 
     try:
-        # Load config from Python file
-        anon_config = _load_config(config)
-
-        # Resolve output path
-        output_path = _resolve_output_path(input_file, output_file)
-        console.print(f"[cyan]Output:[/cyan] {output_path}")
-        console.print(f"[cyan]Config:[/cyan] {config}")
-        console.print(f"[cyan]Seed:[/cyan] {seed}\n")
-
-        # Run anonymization
-        executor = AnonymizationExecutor(anon_config, seed=seed)
-        stats = executor.anonymize_file(input_file, output_path, auto_suffix=False)
-
-        if export_mapping:
-            executor.export_mapping_report(export_mapping)
+        stats = _process(input_file, output_file, config, seed, export_mapping)
 
         console.print("\n[bold green]Anonymization complete![/bold green]")
         console.print(f"  Input:    {input_file}")
-        console.print(f"  Output:   {output_path}")
+        console.print(f"  Output:   {stats['output_file']}")
         console.print(f"  Sheets:   {stats['sheets_processed']}")
         console.print(f"  Rows:     {stats['total_rows']}")
         console.print(f"  Entities: {stats['entity_mappings']['total_mappings']}")
@@ -209,14 +201,56 @@ def process(
         raise typer.Exit(1)
 
 
+def _process(
+    input_file: Path,
+    output_file: Path | None,
+    config: Path,
+    seed: int,
+    export_mapping: Path | None = None,
+) -> dict:
+    """
+    Body of the process command, callable without going through typer.
+
+    Errors are raised rather than turned into an exit code.
+
+    Returns:
+        Anonymization stats from AnonymizationExecutor.anonymize_file
+    """
+    # pylint: disable=import-outside-toplevel
+    from sheetmask.executor import AnonymizationExecutor
+
+    # Load config from Python file
+    anon_config = _load_config(config)
+
+    # Resolve output path
+    output_path = _resolve_output_path(input_file, output_file)
+    console.print(f"[cyan]Output:[/cyan] {output_path}")
+    console.print(f"[cyan]Config:[/cyan] {config}")
+    console.print(f"[cyan]Seed:[/cyan] {seed}\n")
+
+    # Run anonymization
+    executor = AnonymizationExecutor(anon_config, seed=seed)
+    stats = executor.anonymize_file(input_file, output_path, auto_suffix=False)
+
+    if export_mapping:
+        executor.export_mapping_report(export_mapping)
+
+    return stats
+
+
 def _load_config(config_path: Path) -> dict:
-    """Load anonymization config from a Python file."""
+    """
+    Load anonymization config from a Python file.
+
+    exec_module goes through the standard source loader, which already caches
+    the file's bytecode in __pycache__ (revalidated against the source mtime).
+    """
     spec = importlib.util.spec_from_file_location("_anon_config", config_path)
     if spec is None or spec.loader is None:
         raise ValueError(f"Cannot load config file: {config_path}")
     module = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(module)
-    if not hasattr(module, "config"):
+    if not isinstance(getattr(module, "config", None), dict):
         raise ValueError(
             f"{config_path} must define a 'config' dict. "
             "Run 'sheetmask analyze' to generate a starter config."
@@ -5,7 +5,8 @@ Ensures that the same entity value (e.g., "Acme Corp") always maps to the
 same fake value (e.g., "FakeCo Industries") across all columns and sheets.
 """
 
-from typing import Dict
+from functools import partial
+from typing import Callable, Dict, Iterable
 from faker import Faker
 
 
@@ -42,6 +43,19 @@ class EntityMapper:
         # Store mappings: entity_type -> {original_value -> fake_value}
         self.mappings: Dict[str, Dict[str, str]] = {}
 
+        # Fake value generator per supported entity type
+        self._generators: Dict[str, Callable[[], str]] = {
+            "PERSON": self.fake.name,
+            "PERSON_FIRST_NAME": self.fake.first_name,
+            "PERSON_LAST_NAME": self.fake.last_name,
+            "ORGANIZATION": self.fake.company,
+            "EMAIL_ADDRESS": self.fake.email,
+            "PHONE_NUMBER": self.fake.phone_number,
+            "PROJECT_NAME": lambda: f"Project {self.fake.word().title()}",
+            "PROJECT_DESCRIPTION": self.fake.catch_phrase,
+            "LOCATION": lambda: f"{self.fake.city()}, {self.fake.state_abbr()}",
+        }
+
     def get_or_create(self, entity_type: str, original_value: str) -> str:
         """
         Get existing mapping or create new one.
@@ -53,15 +67,52 @@ class EntityMapper:
         Returns:
             Fake value (consistent across calls)
         """
-        if entity_type not in self.mappings:
-            self.mappings[entity_type] = {}
+        bucket = self.mappings.get(entity_type)
+        if bucket is None:
+            bucket = self.mappings[entity_type] = {}
+
+        fake = bucket.get(original_value)
+        if fake is None:
+            fake = bucket[original_value] = self._generate_fake(entity_type)
+
+        return fake
+
+    def bulk_get_or_create(
+        self, entity_type: str, original_values: Iterable[str]
+    ) -> list[str]:
+        """
+        Get or create fakes for many values at once.
 
-        if original_value not in self.mappings[entity_type]:
-            self.mappings[entity_type][original_value] = self._generate_fake(
-                entity_type
-            )
+        Same result as calling get_or_create on each value in order (so
+        seeded output matches), but the bucket and the generator are looked
+        up once per batch instead of once per value.
 
-        return self.mappings[entity_type][original_value]
+        Args:
+            entity_type: Type of entity (PERSON, ORGANIZATION, etc.)
+            original_values: Original values to anonymize
+
+        Returns:
+            Fake values, one per original value
+        """
+        original_values = list(original_values)
+        if not original_values:
+            return []
+
+        bucket = self.mappings.get(entity_type)
+        if bucket is None:
+            bucket = self.mappings[entity_type] = {}
+
+        generate = self._generators.get(entity_type)
+        if generate is None:
+            generate = partial(self._generate_fake, entity_type)
+
+        fakes = []
+        for value in original_values:
+            fake = bucket.get(value)
+            if fake is None:
+                fake = bucket[value] = generate()
+            fakes.append(fake)
+        return fakes
 
     def _generate_fake(self, entity_type: str) -> str:
         """
@@ -78,26 +129,10 @@ class EntityMapper:
         - PROJECT_DESCRIPTION: Short descriptions
         - LOCATION: Office/branch locations
         """
-        if entity_type == "PERSON":
-            return self.fake.name()
-        elif entity_type == "PERSON_FIRST_NAME":
-            return self.fake.first_name()
-        elif entity_type == "PERSON_LAST_NAME":
-            return self.fake.last_name()
-        elif entity_type == "ORGANIZATION":
-            return self.fake.company()
-        elif entity_type == "EMAIL_ADDRESS":
-            return self.fake.email()
-        elif entity_type == "PHONE_NUMBER":
-            return self.fake.phone_number()
-        elif entity_type == "PROJECT_NAME":
-            return f"Project {self.fake.word().title()}"
-        elif entity_type == "PROJECT_DESCRIPTION":
-            return self.fake.catch_phrase()
-        elif entity_type == "LOCATION":
-            return f"{self.fake.city()}, {self.fake.state_abbr()}"
-        else:
+        generator = self._generators.get(entity_type)
+        if generator is None:
             return f"<{entity_type}:{self.fake.word()}>"
+        return generator()
 
     def to_dict(self) -> dict:
         """Export mappings for audit trail"""
@@ -0,0 +1,226 @@
+"""
+Excel reading helpers shared by the analyzers and the executor.
+
+Uses the Rust-backed calamine engine when ``python-calamine`` is installed
+(``pip install sheetmask[fast]``) and pandas is 2.2 or newer, which parses XLSX
+several times faster than openpyxl. Otherwise pandas picks its default engine
+from the file extension.
+
+Setting ``SHEETMASK_CACHE_DIR`` turns on an on-disk Parquet cache of parsed
+sheets (needs ``pyarrow``, ``pip install sheetmask[cache]``), so re-analyzing
+an unchanged file skips Excel parsing. It is opt-in because the cache holds
+the original, un-anonymized data.
+
+``write_sheets`` streams DataFrames out through openpyxl's write-only mode,
+which serializes rows as they are appended instead of building a cell grid.
+"""
+
+import datetime
+import hashlib
+import importlib.util
+import numbers
+import os
+import pandas as pd
+from pathlib import Path
+
+
+def _calamine_available() -> bool:
+    """python-calamine is installed and pandas (2.2+) knows the engine"""
+    if importlib.util.find_spec("python_calamine") is None:
+        return False
+    major, minor = (int(part) for part in pd.__version__.split(".")[:2])
+    return (major, minor) >= (2, 2)
+
+
+ENGINE = "calamine" if _calamine_available() else None
+
+CACHE_DIR_ENV = "SHEETMASK_CACHE_DIR"
+
+
+def read_excel(path: str | Path, **kwargs):
+    """
+    Read an Excel file with the fastest available engine.
+
+    Args:
+        path: Path to Excel file
+        **kwargs: Passed through to pd.read_excel (sheet_name, nrows, ...)
+
+    Returns:
+        DataFrame, or dict of DataFrames when sheet_name selects several sheets
+    """
+    return pd.read_excel(path, engine=ENGINE, **kwargs)
+
+
+def open_workbook(path: str | Path) -> pd.ExcelFile:
+    """Open an Excel file with the fastest available engine."""
+    return pd.ExcelFile(path, engine=ENGINE)
+
+
+def read_sheet(path: str | Path, sheet_name: str | int = 0) -> pd.DataFrame:
+    """
+    Read one sheet, via the Parquet cache when it is enabled.
+
+    Cache entries are keyed by the file's resolved path, mtime and size, so
+    editing or replacing the workbook invalidates them.
+
+    Args:
+        path: Path to Excel file
+        sheet_name: Sheet name or index (default: first sheet)
+
+    Returns:
+        DataFrame of the sheet
+    """
+    cache_dir = _cache_dir(Path(path))
+    if cache_dir is None:
+        return read_excel(path, sheet_name=sheet_name)
+
+    cached = cache_dir / f"{sheet_name}.parquet"
+    if cached.exists():
+        return pd.read_parquet(cached, engine="pyarrow")
+
+    df = read_excel(path, sheet_name=sheet_name)
+    _write_cache(df, cached)
+    return df
+
+
+def write_sheets(path: str | Path, sheets: dict[str, pd.DataFrame]) -> None:
+    """
+    Write DataFrames to an XLSX file, one sheet each, without the index.
+
+    Uses openpyxl's write-only workbook so memory stays flat no matter how
+    large the sheets are. Headers get the same bold, bordered style that
+    DataFrame.to_excel applies, and like to_excel keep their own type
+    (an int or date header stays one). Rows are converted one at a time,
+    so no object copy of the whole sheet is made.
+
+    Args:
+        path: Output path
+        sheets: Mapping of sheet name to DataFrame, in sheet order
+    """
+    # pylint: disable=import-outside-toplevel  # openpyxl loads only when writing
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Border, Font, Side
+
+    thin = Side(style="thin")
+    header_font = Font(bold=True)
+    header_border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    header_alignment = Alignment(horizontal="center", vertical="top")
+
+    workbook = Workbook(write_only=True)
+    for sheet_name, df in sheets.items():
+        sheet = workbook.create_sheet(title=sheet_name)
+
+        header = []
+        for col in df.columns:
+            cell = WriteOnlyCell(sheet, value=_cell_value(col))
+            cell.font = header_font
+            cell.border = header_border
+            cell.alignment = header_alignment
+            header.append(cell)
+        sheet.append(header)
+
+        # Missing values become empty cells. Only the columns that have any
+        # get a null mask, and only rows with a null are copied
+        null_cols = [i for i, (_, col) in enumerate(df.items()) if col.hasnans]
+        null_mask = df.iloc[:, null_cols].isna().to_numpy()
+        has_null = null_mask.any(axis=1).tolist()
+        rows = df.itertuples(index=False, name=None)
+        for row, row_has_null, row_nulls in zip(rows, has_null, null_mask):
+            if row_has_null:
+                row = list(row)
+                for i, is_null in zip(null_cols, row_nulls):
+                    if is_null:
+                        row[i] = None
+            sheet.append(row)
+
+    workbook.save(path)
+
+
+def _cell_value(value):
+    """value as is if openpyxl can store it, else its str()"""
+    if value is None or isinstance(
+        value,
+        (str, numbers.Real, datetime.date, datetime.time, datetime.timedelta),
+    ):
+        return value
+    return str(value)
+
+
+def read_sheet_head(
+    workbook: pd.ExcelFile, sheet_name: str | int, nrows: int
+) -> tuple[pd.DataFrame, int]:
+    """
+    Read the first rows of a sheet plus the sheet's total row count.
+
+    Both come from the already-open workbook, so the file is not reopened.
+    The count comes from sheet metadata where the engine exposes it
+    (calamine, or openpyxl's recorded dimensions), so large sheets are never
+    loaded in full just to be counted. Leading blank rows are counted, as
+    pandas keeps them; metadata counts can include trailing blank rows that
+    pandas would drop.
+
+    Args:
+        workbook: Open workbook (see open_workbook)
+        sheet_name: Sheet name or index
+        nrows: Number of data rows to read
+
+    Returns:
+        Tuple of (head DataFrame, total data rows in the sheet)
+    """
+    head = workbook.parse(sheet_name, nrows=nrows)
+    if len(head) < nrows:
+        return head, len(head)
+
+    height = _sheet_height(workbook, sheet_name)
+    if height is None:
+        # No metadata available; fall back to a full read
+        return head, len(workbook.parse(sheet_name))
+    # Height includes the header row
+    return head, max(height - 1, len(head))
+
+
+def _sheet_height(workbook: pd.ExcelFile, sheet_name: str | int) -> int | None:
+    """Rows from the top of the sheet to its last used row, or None if unknown"""
+    book = workbook.book
+    if workbook.engine == "calamine":
+        if isinstance(sheet_name, int):
+            sheet = book.get_sheet_by_index(sheet_name)
+        else:
+            sheet = book.get_sheet_by_name(sheet_name)
+        # height only spans the used range, which skips leading blank rows;
+        # end is the (0-based) last used cell, counted from the top
+        return 0 if sheet.end is None else sheet.end[0] + 1
+
+    if workbook.engine == "openpyxl":
+        if isinstance(sheet_name, int):
+            return book.worksheets[sheet_name].max_row
+        return book[sheet_name].max_row
+
+    return None
+
+
+def _cache_dir(path: Path) -> Path | None:
+    """Cache directory for this version of the file, or None if caching is off"""
+    root = os.environ.get(CACHE_DIR_ENV)
+    if not root or not importlib.util.find_spec("pyarrow"):
+        return None
+
+    stat = path.stat()
+    key = f"{path.resolve()}|{stat.st_mtime_ns}|{stat.st_size}"
+    digest = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+    return Path(root).expanduser() / digest
+
+
+def _write_cache(df: pd.DataFrame, cached: Path) -> None:
+    """Write a sheet to the cache; sheets Parquet can't represent are skipped"""
+    cached.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cached.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        df.to_parquet(tmp, engine="pyarrow", compression="zstd")
+    except (ValueError, TypeError, NotImplementedError):
+        # e.g. mixed-type object columns or non-string headers
+        tmp.unlink(missing_ok=True)
+        return
+    # Atomic rename so concurrent readers never see a partial file
+    os.replace(tmp, cached)
@@ -12,19 +12,46 @@ Architecture:
     7. Write anonymized Excel file
 """
 
+import importlib.util
 import json
-import random as stdlib_random
+from collections.abc import Iterator, Mapping
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from typing import Dict
 
 from sheetmask.entity_mapper import EntityMapper
+from sheetmask.excel_io import open_workbook, write_sheets
 from sheetmask.rules import (
     NumericAnonymizationRule,
     PercentageVarianceRule,
     PreserveRelationshipRule,
+    apply_variance_rules,
 )
 
+ORJSON = importlib.util.find_spec("orjson") is not None
+
+
+class _ColumnContext(Mapping):
+    """
+    Read-only column view of a DataFrame, passed to rules as their context.
+
+    Columns are looked up only when a formula uses them, rather than
+    building a Series for every column of a wide sheet up front.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self._df = df
+
+    def __getitem__(self, col: str) -> pd.Series:
+        return self._df[col]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._df.columns)
+
+    def __len__(self) -> int:
+        return len(self._df.columns)
+
 
 class AnonymizationExecutor:
     """
@@ -56,9 +83,7 @@ class AnonymizationExecutor:
         self.config = config
         self.entity_mapper = EntityMapper(seed=seed)
         self.seed = seed
-        self.rng = (
-            stdlib_random.Random(seed) if seed is not None else stdlib_random.Random()
-        )
+        self.rng = np.random.default_rng(seed)
 
     def anonymize_file(
         self, input_path: str | Path, output_path: str | Path, auto_suffix: bool = True
@@ -78,39 +103,40 @@ class AnonymizationExecutor:
         output_path = Path(output_path)
 
         # Ensure output filename indicates it's anonymized (unless disabled)
-        if auto_suffix and "(ANONYMIZED)" not in output_path.stem:
-            # Insert "(ANONYMIZED)" before file extension
-            output_path = output_path.with_stem(f"{output_path.stem} (ANONYMIZED)")
+        if auto_suffix:
+            stem = output_path.stem
+            if "(ANONYMIZED)" not in stem:
+                # Insert "(ANONYMIZED)" before file extension
+                output_path = output_path.with_name(
+                    f"{stem} (ANONYMIZED){output_path.suffix}"
+                )
 
-        # Step 1: Load all sheets
+        # Step 1 + 2: Open the workbook once and read only the configured sheets
         print(f"Loading: {input_path.name}")
-        xls = pd.ExcelFile(input_path)
-        all_sheets = {
-            name: pd.read_excel(input_path, sheet_name=name) for name in xls.sheet_names
-        }
-        print(f"  Loaded {len(all_sheets)} sheets")
-
-        # Step 2: Filter sheets (keep only configured sheets)
         sheets_to_keep = self.config.get("sheets_to_keep")
-        if sheets_to_keep:
-            filtered_sheets = {
-                name: df for name, df in all_sheets.items() if name in sheets_to_keep
-            }
-            print(
-                f"  Keeping {len(filtered_sheets)}/{len(all_sheets)} sheets: {list(filtered_sheets.keys())}"
-            )
-            if not filtered_sheets:
-                available = list(all_sheets.keys())
-                missing = [s for s in sheets_to_keep if s not in all_sheets]
-                raise ValueError(
-                    f"No sheets found after filtering. "
-                    f"Requested: {sheets_to_keep}. "
-                    f"Available sheets: {available}. "
-                    f"Missing: {missing}"
+        with open_workbook(input_path) as xls:
+            available = xls.sheet_names
+            print(f"  Found {len(available)} sheets")
+
+            if sheets_to_keep:
+                sheet_names = [name for name in available if name in sheets_to_keep]
+                print(
+                    f"  Keeping {len(sheet_names)}/{len(available)} sheets: {sheet_names}"
                 )
-        else:
-            filtered_sheets = all_sheets
-            print(f"  No sheet filtering (keeping all {len(filtered_sheets)} sheets)")
+                if not sheet_names:
+                    missing = [s for s in sheets_to_keep if s not in available]
+                    raise ValueError(
+                        f"No sheets found after filtering. "
+                        f"Requested: {sheets_to_keep}. "
+                        f"Available sheets: {available}. "
+                        f"Missing: {missing}"
+                    )
+            else:
+                sheet_names = available
+                print(f"  No sheet filtering (keeping all {len(sheet_names)} sheets)")
+
+            # Unkept sheets are never parsed
+            filtered_sheets = xls.parse(sheet_names)
 
         # Step 3: Anonymize each sheet
         anonymized_sheets = {}
@@ -124,10 +150,9 @@ class AnonymizationExecutor:
 
         # Step 4: Write to Excel
         print(f"\nWriting: {output_path.name}")
-        with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
-            for sheet_name, df in anonymized_sheets.items():
-                df.to_excel(writer, sheet_name=sheet_name, index=False)
-                print(f"  Wrote '{sheet_name}'")
+        write_sheets(output_path, anonymized_sheets)
+        for sheet_name in anonymized_sheets:
+            print(f"  Wrote '{sheet_name}'")
 
         # Step 5: Return stats
         stats = {
@@ -159,16 +184,16 @@ class AnonymizationExecutor:
         Returns:
             Anonymized DataFrame
         """
-        df = df.copy()
+        # Columns are only ever replaced, never written into, so a shallow
+        # copy keeps the caller's frame intact without cloning every block
+        df = df.copy(deep=False)
 
         # Step 1: Anonymize entity columns
         entity_columns = self.config.get("entity_columns", {})
         for col_name, entity_type in entity_columns.items():
             if col_name in df.columns:
                 print(f"    Anonymizing entities: {col_name} ({entity_type})")
-                df[col_name] = df[col_name].apply(
-                    lambda val, et=entity_type: self._anonymize_entity(val, et)
-                )
+                df[col_name] = self._anonymize_entity_column(df[col_name], entity_type)
 
         # Step 2: Anonymize numeric columns
         numeric_rules = self.config.get("numeric_rules", {})
@@ -179,28 +204,45 @@ class AnonymizationExecutor:
 
         return df
 
-    def _anonymize_entity(self, value, entity_type: str) -> str:
+    def _anonymize_entity_column(
+        self, series: pd.Series, entity_type: str
+    ) -> pd.Series:
         """
-        Anonymize a single entity value.
+        Anonymize an entity column.
+
+        Only the distinct values go through the entity mapper (in order of
+        first appearance, so seeded fakes are stable). Values are keyed by
+        str(value), as the mapper always has been, so True/1/1.0 stay distinct,
+        dates keep their time part and categorical columns work. The keys are
+        factorized once and the column rebuilt with an array take, so the
+        mapper is called once per distinct value, not per cell.
 
         Args:
-            value: Original value
+            series: Original column
             entity_type: Entity type (PERSON, ORGANIZATION, etc.)
 
         Returns:
-            Anonymized value (or original if null/empty)
+            Anonymized column (null/empty values kept as-is)
         """
-        # Skip null/empty values
-        if pd.isna(value) or value == "":
-            return value
-
-        # Convert to string for mapping
-        original_str = str(value)
-
-        # Get or create fake value (globally consistent)
-        fake_value = self.entity_mapper.get_or_create(entity_type, original_str)
+        notna = series.notna().to_numpy()
+        # Uniques are in order of first appearance
+        # map(str) rather than astype(str): astype drops the time part of
+        # datetime64 values, which str(value) keeps
+        codes, uniques = pd.factorize(series[notna].map(str))
+        if len(uniques) == 0:
+            return series
+
+        # Get or create fake value per distinct value (globally consistent),
+        # in one batch; empty strings are kept as-is
+        fakes = np.array(uniques, dtype=object)
+        named = fakes != ""
+        fakes[named] = self.entity_mapper.bulk_get_or_create(
+            entity_type, fakes[named].tolist()
+        )
 
-        return fake_value
+        values = series.to_numpy(dtype=object, copy=True)
+        values[notna] = fakes.take(codes)
+        return pd.Series(values, index=series.index, name=series.name)
 
     def _apply_numeric_rules(
         self, df: pd.DataFrame, numeric_rules: Dict[str, NumericAnonymizationRule]
@@ -208,6 +250,9 @@ class AnonymizationExecutor:
         """
         Apply numeric anonymization rules to DataFrame.
 
+        Derived columns are assigned into df in place; only _anonymize_sheet
+        calls this, with its own copy.
+
         Args:
             df: DataFrame to anonymize
             numeric_rules: Dict of column_name -> NumericAnonymizationRule
@@ -215,32 +260,26 @@ class AnonymizationExecutor:
         Returns:
             DataFrame with anonymized numeric columns
         """
-        df = df.copy()
-
-        # Build context dict (all columns available for relationship rules)
-        context = {col: df[col] for col in df.columns}
-
         # Apply rules in dependency order
         # First: Apply PercentageVarianceRule (base values)
         # Second: Apply PreserveRelationshipRule (derived values)
 
-        # Phase 1: Base values (PercentageVarianceRule)
-        for col_name, rule in numeric_rules.items():
-            if col_name not in df.columns:
-                continue
+        # Phase 1: Base values (PercentageVarianceRule), all columns at once
+        variance_rules = {
+            col_name: rule
+            for col_name, rule in numeric_rules.items()
+            if col_name in df.columns and isinstance(rule, PercentageVarianceRule)
+        }
+        for col_name, rule in variance_rules.items():
+            print(
+                f"    Anonymizing numeric: {col_name} (±{rule.variance_pct*100:.0f}% variance)"
+            )
+        # Executor's seeded rng is used for reproducibility
+        df = apply_variance_rules(df, variance_rules, self.rng)
 
-            if isinstance(rule, PercentageVarianceRule):
-                # Inject executor's seeded rng for reproducibility
-                rule_with_rng = PercentageVarianceRule(
-                    variance_pct=rule.variance_pct,
-                    rng=self.rng,
-                )
-                print(
-                    f"    Anonymizing numeric: {col_name} (±{rule.variance_pct*100:.0f}% variance)"
-                )
-                df[col_name] = rule_with_rng.apply(df[col_name], context)
-                # Update context with anonymized value
-                context[col_name] = df[col_name]
+        # All columns are available to relationship rules; the view reads df
+        # live, so each rule sees the anonymized and recomputed values
+        context = _ColumnContext(df)
 
         # Phase 2: Derived values (PreserveRelationshipRule)
         for col_name, rule in numeric_rules.items():
@@ -252,8 +291,6 @@ class AnonymizationExecutor:
                     f"    Recomputing: {col_name} (from {', '.join(rule.dependent_columns)})"
                 )
                 df[col_name] = rule.apply(df[col_name], context)
-                # Update context with recomputed value
-                context[col_name] = df[col_name]
 
         return df
 
@@ -261,6 +298,9 @@ class AnonymizationExecutor:
         """
         Export entity mapping report for audit trail.
 
+        Uses orjson when installed (``pip install sheetmask[fast]``), which
+        encodes large reports several times faster than the json module.
+
         Args:
             output_path: Path to write mapping report (JSON)
         """
@@ -268,7 +308,13 @@ class AnonymizationExecutor:
         output_path = Path(output_path)
         mappings = self.entity_mapper.to_dict()
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(mappings, f, indent=2)
+        if ORJSON:
+            # pylint: disable=no-member  # orjson is a compiled extension
+            import orjson  # pylint: disable=import-outside-toplevel
+
+            output_path.write_bytes(orjson.dumps(mappings, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_path, "w", encoding="utf-8") as f:
+                json.dump(mappings, f, indent=2)
 
         print(f"Mapping report exported: {output_path}")
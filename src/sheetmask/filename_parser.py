@@ -15,13 +15,104 @@ Quarters default to first day of the quarter's last month (Q3 = Jul 1).
 
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import date
-from typing import Optional
-
-
-@dataclass
+from typing import Callable, Optional
+
+MONTH_ABBREVIATIONS = {
+    "Jan": 1,
+    "Feb": 2,
+    "Mar": 3,
+    "Apr": 4,
+    "May": 5,
+    "Jun": 6,
+    "Jul": 7,
+    "Aug": 8,
+    "Sep": 9,
+    "Oct": 10,
+    "Nov": 11,
+    "Dec": 12,
+}
+
+MONTH_NAMES = {
+    "january": 1,
+    "february": 2,
+    "march": 3,
+    "april": 4,
+    "may": 5,
+    "june": 6,
+    "july": 7,
+    "august": 8,
+    "september": 9,
+    "october": 10,
+    "november": 11,
+    "december": 12,
+}
+
+# Quarter to first month of quarter
+QUARTER_MONTHS = {1: 1, 2: 4, 3: 7, 4: 10}
+
+# Lowercased abbreviations and full names in one table; matching is
+# case-insensitive, so every lookup goes through str.lower()
+_MONTHS = {
+    name.lower(): number
+    for table in (MONTH_ABBREVIATIONS, MONTH_NAMES)
+    for name, number in table.items()
+}
+
+# Every supported format, highest confidence first. Group names are
+# prefixed so the patterns can share one compiled regex.
+_DATE_PATTERNS = {
+    # 3-letter month abbreviation followed by -YY
+    "month_dash_yy": (
+        rf"\b(?P<mdy_month>{'|'.join(MONTH_ABBREVIATIONS)})-(?P<mdy_year>\d{{2}})\b"
+    ),
+    # Use negative lookaround instead of \b so that underscore-delimited dates
+    # (e.g. "report_2024-03.xlsx") are matched. \b treats _ as a word character
+    # and would fail between '_' and '2'.
+    "yyyy_mm": (
+        r"(?<![a-zA-Z0-9])(?P<ym_year>20\d{2})-(?P<ym_month>0[1-9]|1[0-2])"
+        r"(?![a-zA-Z0-9])"
+    ),
+    "mm_yyyy": (
+        r"(?<![a-zA-Z0-9])(?P<my_month>0[1-9]|1[0-2])-(?P<my_year>20\d{2})"
+        r"(?![a-zA-Z0-9])"
+    ),
+    "month_yyyy": rf"\b(?P<fm_month>{'|'.join(MONTH_NAMES)})\s+(?P<fm_year>20\d{{2}})\b",
+    "yyyy_month": rf"\b(?P<yf_year>20\d{{2}})\s+(?P<yf_month>{'|'.join(MONTH_NAMES)})\b",
+    "yyyy_quarter": r"\b(?P<yq_year>20\d{2})-Q(?P<yq_quarter>[1-4])\b",
+    "quarter_yyyy": r"\bQ(?P<qy_quarter>[1-4])-(?P<qy_year>20\d{2})\b",
+    # Allow word boundaries or underscores around the date
+    "yyyymmdd": (
+        r"(?:^|[_\s])(?P<ymd_year>20\d{2})(?P<ymd_month>0[1-9]|1[0-2])"
+        r"(?:0[1-9]|[12][0-9]|3[01])(?:[_\s]|$|\.)"
+    ),
+    # ##-##-#### or ##/##/####
+    "slash_or_dash": (
+        r"\b(?P<sd_first>\d{1,2})[-/](?P<sd_second>\d{1,2})[-/](?P<sd_year>20\d{2})\b"
+    ),
+    "year_only": r"\b(?P<y_year>20\d{2})\b",
+}
+
+_PRIORITY = {name: rank for rank, name in enumerate(_DATE_PATTERNS)}
+
+# All formats in one pattern, compiled once at import; the parser runs per
+# file in batch jobs. The lookahead is zero-width, so finditer tries every
+# position and overlapping candidates are all found in a single scan.
+_DATE_RE = re.compile(
+    "(?=(?:"
+    + "|".join(f"(?P<{name}>{pattern})" for name, pattern in _DATE_PATTERNS.items())
+    + "))",
+    re.IGNORECASE,
+)
+
+# Every supported format contains digits, so names without any can't match
+_DIGIT_RE = re.compile(r"\d")
+
+
+@dataclass(frozen=True)
 class DateParseResult:
-    """Result of parsing a date from a filename."""
+    """Result of parsing a date from a filename (immutable, results are cached)."""
 
     date: Optional[date]
     confidence: str  # "High", "Medium", "Low", "None"
@@ -29,10 +120,21 @@ class DateParseResult:
     original_text: Optional[str] = None  # The text that was matched
 
 
+_NO_DATE = DateParseResult(
+    date=None,
+    confidence="None",
+    pattern="No date found in filename",
+    original_text=None,
+)
+
+
+@lru_cache(maxsize=1024)
 def parse_date_from_filename(filename: str) -> DateParseResult:
     """
     Parse date from filename using pattern matching.
 
+    Results are memoized, since batch runs parse the same names repeatedly.
+
     Args:
         filename: Filename to parse
 
@@ -46,179 +148,103 @@ def parse_date_from_filename(filename: str) -> DateParseResult:
         >>> parse_date_from_filename("2024-Q3-Final.xlsx")
         DateParseResult(date=date(2024, 7, 1), confidence="High", ...)
     """
-    # Try patterns in order of confidence (high to low)
-
-    # Pattern 1: Month-YY (Dec-24, Nov-24) - HIGH CONFIDENCE
-    result = _try_month_dash_year_short(filename)
-    if result:
-        return result
-
-    # Pattern 2: YYYY-MM or MM-YYYY - HIGH CONFIDENCE
-    result = _try_year_month_dash(filename)
-    if result:
-        return result
-
-    # Pattern 3: Full month name (December 2024) - HIGH CONFIDENCE
-    result = _try_full_month_name(filename)
-    if result:
-        return result
-
-    # Pattern 4: Quarter (Q1, Q2, Q3, Q4) - HIGH CONFIDENCE
-    result = _try_quarter(filename)
-    if result:
-        return result
-
-    # Pattern 5: YYYYMMDD (20241201) - HIGH CONFIDENCE
-    result = _try_yyyymmdd(filename)
-    if result:
-        return result
-
-    # Pattern 6: MM-DD-YYYY or DD-MM-YYYY - MEDIUM/LOW CONFIDENCE (ambiguous)
-    result = _try_slash_or_dash_date(filename)
-    if result:
-        return result
-
-    # Pattern 7: Year only (2024) - LOW CONFIDENCE
-    result = _try_year_only(filename)
-    if result:
-        return result
+    if not _DIGIT_RE.search(filename):
+        return _NO_DATE
+
+    # Formats win in order of confidence (high to low), then by position.
+    # Full month names rank earlier months first, matching the original
+    # one-pattern-per-month search order.
+    tried = set()
+    for match in sorted(_DATE_RE.finditer(filename), key=_match_rank):
+        # Like a per-format search, only the best match of each format is
+        # considered; if it doesn't validate, fall through to the next format
+        if match.lastgroup in tried:
+            continue
+        tried.add(match.lastgroup)
+
+        result = _HANDLERS[match.lastgroup](match)
+        if result:
+            return result
 
     # No date found
-    return DateParseResult(
-        date=None,
-        confidence="None",
-        pattern="No date found in filename",
-        original_text=None,
-    )
+    return _NO_DATE
 
 
-def _try_month_dash_year_short(filename: str) -> Optional[DateParseResult]:
-    """Try Month-YY format (Dec-24, Nov-24)"""
-    # Pattern: 3-letter month abbreviation followed by -YY
-    pattern = r"\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)-(\d{2})\b"
-    match = re.search(pattern, filename, re.IGNORECASE)
-
-    if match:
-        month_abbr = match.group(1).capitalize()
-        year_short = int(match.group(2))
-
-        # Convert 2-digit year to 4-digit (assume 20xx for now)
-        year = 2000 + year_short
-
-        # Month name to number
-        month_map = {
-            "Jan": 1,
-            "Feb": 2,
-            "Mar": 3,
-            "Apr": 4,
-            "May": 5,
-            "Jun": 6,
-            "Jul": 7,
-            "Aug": 8,
-            "Sep": 9,
-            "Oct": 10,
-            "Nov": 11,
-            "Dec": 12,
-        }
-        month = month_map[month_abbr]
+def _match_rank(match: re.Match) -> tuple[int, int, int]:
+    """Sort key: format priority, month (full month names only), position"""
+    month = 0
+    if match.lastgroup == "month_yyyy":
+        month = _MONTHS[match.group("fm_month").lower()]
+    elif match.lastgroup == "yyyy_month":
+        month = _MONTHS[match.group("yf_month").lower()]
+    return _PRIORITY[match.lastgroup], month, match.start()
 
-        return DateParseResult(
-            date=date(year, month, 1),  # First of month
-            confidence="High",
-            pattern="Month-YY",
-            original_text=match.group(0),
-        )
 
-    return None
+def _month_dash_year_short(match: re.Match) -> DateParseResult:
+    """Month-YY format (Dec-24, Nov-24)"""
+    # Convert 2-digit year to 4-digit (assume 20xx for now)
+    year = 2000 + int(match.group("mdy_year"))
+    month = _MONTHS[match.group("mdy_month").lower()]
 
+    return DateParseResult(
+        date=date(year, month, 1),  # First of month
+        confidence="High",
+        pattern="Month-YY",
+        original_text=match.group("month_dash_yy"),
+    )
 
-def _try_year_month_dash(filename: str) -> Optional[DateParseResult]:
-    """Try YYYY-MM or MM-YYYY format"""
-    # Try YYYY-MM first.
-    # Use negative lookaround instead of \b so that underscore-delimited dates
-    # (e.g. "report_2024-03.xlsx") are matched. \b treats _ as a word character
-    # and would fail between '_' and '2'.
-    pattern1 = r"(?<![a-zA-Z0-9])(20\d{2})-(0[1-9]|1[0-2])(?![a-zA-Z0-9])"
-    match = re.search(pattern1, filename)
 
-    if match:
-        year = int(match.group(1))
-        month = int(match.group(2))
+def _year_month_dash(match: re.Match) -> DateParseResult:
+    """YYYY-MM format"""
+    return DateParseResult(
+        date=date(int(match.group("ym_year")), int(match.group("ym_month")), 1),
+        confidence="High",
+        pattern="YYYY-MM",
+        original_text=match.group("yyyy_mm"),
+    )
 
-        return DateParseResult(
-            date=date(year, month, 1),
-            confidence="High",
-            pattern="YYYY-MM",
-            original_text=match.group(0),
-        )
 
-    # Try MM-YYYY
-    pattern2 = r"(?<![a-zA-Z0-9])(0[1-9]|1[0-2])-(20\d{2})(?![a-zA-Z0-9])"
-    match = re.search(pattern2, filename)
+def _month_year_dash(match: re.Match) -> DateParseResult:
+    """MM-YYYY format"""
+    return DateParseResult(
+        date=date(int(match.group("my_year")), int(match.group("my_month")), 1),
+        confidence="High",
+        pattern="MM-YYYY",
+        original_text=match.group("mm_yyyy"),
+    )
 
-    if match:
-        month = int(match.group(1))
-        year = int(match.group(2))
 
-        return DateParseResult(
-            date=date(year, month, 1),
-            confidence="High",
-            pattern="MM-YYYY",
-            original_text=match.group(0),
-        )
+def _full_month_year(match: re.Match) -> DateParseResult:
+    """Full month name then year (December 2024)"""
+    return DateParseResult(
+        date=date(
+            int(match.group("fm_year")),
+            _MONTHS[match.group("fm_month").lower()],
+            1,
+        ),
+        confidence="High",
+        pattern="Full Month YYYY",
+        original_text=match.group("month_yyyy"),
+    )
+
 
-    return None
-
-
-def _try_full_month_name(filename: str) -> Optional[DateParseResult]:
-    """Try full month name (December 2024, 2024 December)"""
-    months = {
-        "january": 1,
-        "february": 2,
-        "march": 3,
-        "april": 4,
-        "may": 5,
-        "june": 6,
-        "july": 7,
-        "august": 8,
-        "september": 9,
-        "october": 10,
-        "november": 11,
-        "december": 12,
-    }
-
-    # Try "Month YYYY"
-    for month_name, month_num in months.items():
-        pattern = rf"\b{month_name}\s+(20\d{{2}})\b"
-        match = re.search(pattern, filename, re.IGNORECASE)
-        if match:
-            year = int(match.group(1))
-            return DateParseResult(
-                date=date(year, month_num, 1),
-                confidence="High",
-                pattern="Full Month YYYY",
-                original_text=match.group(0),
-            )
-
-    # Try "YYYY Month"
-    for month_name, month_num in months.items():
-        pattern = rf"\b(20\d{{2}})\s+{month_name}\b"
-        match = re.search(pattern, filename, re.IGNORECASE)
-        if match:
-            year = int(match.group(1))
-            return DateParseResult(
-                date=date(year, month_num, 1),
-                confidence="High",
-                pattern="YYYY Full Month",
-                original_text=match.group(0),
-            )
-
-    return None
-
-
-def _try_quarter(filename: str) -> Optional[DateParseResult]:
+def _year_full_month(match: re.Match) -> DateParseResult:
+    """Year then full month name (2024 December)"""
+    return DateParseResult(
+        date=date(
+            int(match.group("yf_year")),
+            _MONTHS[match.group("yf_month").lower()],
+            1,
+        ),
+        confidence="High",
+        pattern="YYYY Full Month",
+        original_text=match.group("yyyy_month"),
+    )
+
+
+def _year_quarter(match: re.Match) -> DateParseResult:
     """
-    Try quarter format (Q1, Q2, Q3, Q4).
+    YYYY-Q# format.
 
     Returns first day of the quarter's LAST month:
     - Q1 = Jan 1 (Jan is last month of Q1: Jan-Mar)
@@ -226,129 +252,91 @@ def _try_quarter(filename: str) -> Optional[DateParseResult]:
     - Q3 = Jul 1 (Jul is last month of Q3: Jul-Sep)
     - Q4 = Oct 1 (Oct is last month of Q4: Oct-Dec)
     """
-    # Pattern: Q1, Q2, Q3, Q4 with optional year
-    # Try YYYY-Q# first
-    pattern1 = r"\b(20\d{2})-Q([1-4])\b"
-    match = re.search(pattern1, filename, re.IGNORECASE)
-
-    if match:
-        year = int(match.group(1))
-        quarter = int(match.group(2))
+    month = QUARTER_MONTHS[int(match.group("yq_quarter"))]
 
-        # Quarter to first month of quarter
-        quarter_months = {1: 1, 2: 4, 3: 7, 4: 10}
-        month = quarter_months[quarter]
-
-        return DateParseResult(
-            date=date(year, month, 1),
-            confidence="High",
-            pattern="YYYY-Q#",
-            original_text=match.group(0),
-        )
+    return DateParseResult(
+        date=date(int(match.group("yq_year")), month, 1),
+        confidence="High",
+        pattern="YYYY-Q#",
+        original_text=match.group("yyyy_quarter"),
+    )
 
-    # Try Q#-YYYY
-    pattern2 = r"\bQ([1-4])-(20\d{2})\b"
-    match = re.search(pattern2, filename, re.IGNORECASE)
 
-    if match:
-        quarter = int(match.group(1))
-        year = int(match.group(2))
+def _quarter_year(match: re.Match) -> DateParseResult:
+    """Q#-YYYY format (see _year_quarter for the month used)"""
+    month = QUARTER_MONTHS[int(match.group("qy_quarter"))]
 
-        quarter_months = {1: 1, 2: 4, 3: 7, 4: 10}
-        month = quarter_months[quarter]
+    return DateParseResult(
+        date=date(int(match.group("qy_year")), month, 1),
+        confidence="Medium",
+        pattern="Q#-YYYY",
+        original_text=match.group("quarter_yyyy"),
+    )
 
-        return DateParseResult(
-            date=date(year, month, 1),
-            confidence="Medium",
-            pattern="Q#-YYYY",
-            original_text=match.group(0),
-        )
 
-    return None
+def _yyyymmdd(match: re.Match) -> DateParseResult:
+    """YYYYMMDD format (20241201)"""
+    return DateParseResult(
+        # Use day 1 always (per requirements)
+        date=date(int(match.group("ymd_year")), int(match.group("ymd_month")), 1),
+        confidence="High",
+        pattern="YYYYMMDD",
+        original_text=match.group("yyyymmdd"),
+    )
 
 
-def _try_yyyymmdd(filename: str) -> Optional[DateParseResult]:
-    """Try YYYYMMDD format (20241201)"""
-    # Allow word boundaries or underscores around the date
-    pattern = (
-        r"(?:^|[_\s])(20\d{2})(0[1-9]|1[0-2])(0[1-9]|[12][0-9]|3[01])(?:[_\s]|$|\.)"
-    )
-    match = re.search(pattern, filename)
-
-    if match:
-        year = int(match.group(1))
-        month = int(match.group(2))
-        _ = int(match.group(3))
-
-        try:
-            # Use day 1 always (per requirements)
-            parsed_date = date(year, month, 1)
-            return DateParseResult(
-                date=parsed_date,
-                confidence="High",
-                pattern="YYYYMMDD",
-                original_text=match.group(0),
-            )
-        except ValueError:
-            # Invalid date (e.g., Feb 31)
-            return None
-
-    return None
-
-
-def _try_slash_or_dash_date(filename: str) -> Optional[DateParseResult]:
+def _slash_or_dash_date(match: re.Match) -> Optional[DateParseResult]:
     """
-    Try MM-DD-YYYY or DD-MM-YYYY format (ambiguous).
+    MM-DD-YYYY or DD-MM-YYYY format (ambiguous).
 
     Returns medium/low confidence since format is ambiguous.
     """
-    # Pattern: ##-##-#### or ##/##/####
-    pattern = r"\b(\d{1,2})[-/](\d{1,2})[-/](20\d{2})\b"
-    match = re.search(pattern, filename)
-
-    if match:
-        first = int(match.group(1))
-        second = int(match.group(2))
-        year = int(match.group(3))
-
-        # Assume MM-DD-YYYY if first number is <= 12
-        if first <= 12:
-            month = first
-            confidence = "Medium"
-        # Otherwise assume DD-MM-YYYY
-        elif second <= 12:
-            month = second
-            confidence = "Low"
-        else:
-            # Can't determine
-            return None
-
-        try:
-            return DateParseResult(
-                date=date(year, month, 1),  # Use first of month
-                confidence=confidence,
-                pattern="MM-DD-YYYY or DD-MM-YYYY (ambiguous)",
-                original_text=match.group(0),
-            )
-        except ValueError:
-            return None
-
-    return None
-
-
-def _try_year_only(filename: str) -> Optional[DateParseResult]:
-    """Try year-only format (2024) - returns Jan 1"""
-    pattern = r"\b(20\d{2})\b"
-    match = re.search(pattern, filename)
-
-    if match:
-        year = int(match.group(1))
-
+    first = int(match.group("sd_first"))
+    second = int(match.group("sd_second"))
+
+    # Assume MM-DD-YYYY if first number is <= 12
+    if first <= 12:
+        month = first
+        confidence = "Medium"
+    # Otherwise assume DD-MM-YYYY
+    elif second <= 12:
+        month = second
+        confidence = "Low"
+    else:
+        # Can't determine
+        return None
+
+    try:
         return DateParseResult(
-            date=date(year, 1, 1),  # Jan 1 of that year
-            confidence="Low",
-            pattern="Year only",
-            original_text=match.group(0),
+            date=date(int(match.group("sd_year")), month, 1),  # Use first of month
+            confidence=confidence,
+            pattern="MM-DD-YYYY or DD-MM-YYYY (ambiguous)",
+            original_text=match.group("slash_or_dash"),
         )
+    except ValueError:
+        # Month 0 (e.g. "00-05-2024")
+        return None
+
+
+def _year_only(match: re.Match) -> DateParseResult:
+    """Year-only format (2024) - returns Jan 1"""
+    return DateParseResult(
+        date=date(int(match.group("y_year")), 1, 1),  # Jan 1 of that year
+        confidence="Low",
+        pattern="Year only",
+        original_text=match.group("year_only"),
+    )
+
 
-    return None
+_HANDLERS: dict[str, Callable[[re.Match], Optional[DateParseResult]]] = {
+    "month_dash_yy": _month_dash_year_short,
+    "yyyy_mm": _year_month_dash,
+    "mm_yyyy": _month_year_dash,
+    "month_yyyy": _full_month_year,
+    "yyyy_month": _year_full_month,
+    "yyyy_quarter": _year_quarter,
+    "quarter_yyyy": _quarter_year,
+    "yyyymmdd": _yyyymmdd,
+    "slash_or_dash": _slash_or_dash_date,
+    "year_only": _year_only,
+}
@@ -5,13 +5,18 @@ Detects schema stability, data patterns, and quality issues by analyzing
 multiple files representing different time periods.
 """
 
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import List
-from collections import defaultdict
+from typing import List, Tuple
+from collections import Counter
 
+from sheetmask.excel_io import read_excel, read_sheet
 from sheetmask.filename_parser import parse_date_from_filename
 
+# Rows read per file when only column names and dtypes are needed
+SCHEMA_SAMPLE_ROWS = 200
+
 
 def analyze_multiple_files(file_paths: List[Path]) -> str:
     """
@@ -43,11 +48,14 @@ def analyze_multiple_files(file_paths: List[Path]) -> str:
     # Sort by date (None dates go to end)
     file_info.sort(key=lambda x: (x["date"] is None, x["date"]))
 
+    # Read each file once; both comparisons use the same scan
+    scans = [_scan_file(path) for path in file_paths]
+
     # Compare schemas
-    schema_comparison = compare_schemas(file_paths)
+    schema_comparison = _compare_schemas([schema for schema, _ in scans])
 
     # Compare data patterns
-    data_patterns = compare_data_patterns(file_paths)
+    data_patterns = _compare_data_patterns([stats for _, stats in scans])
 
     # Build prompt
     prompt = _build_multi_month_prompt(file_info, schema_comparison, data_patterns)
@@ -67,39 +75,13 @@ def compare_schemas(file_paths: List[Path]) -> dict:
     if not file_paths:
         raise ValueError("No files provided for schema comparison")
 
-    # Read first sheet from each file
-    file_schemas = []
-    for path in file_paths:
-        df = pd.read_excel(path)
-        file_schemas.append(
-            {
-                "path": path,
-                "columns": set(df.columns),
-                "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()},
-            }
-        )
-
-    # Find stable columns (in all files)
-    all_columns = set.intersection(*[s["columns"] for s in file_schemas])
-    stable_columns = list(all_columns)
-
-    # Find variable columns (not in all files)
-    all_possible_columns = set.union(*[s["columns"] for s in file_schemas])
-    variable_columns = {}
-
-    for col in all_possible_columns:
-        if col not in all_columns:
-            present_count = sum(1 for s in file_schemas if col in s["columns"])
-            variable_columns[col] = {
-                "present_in": present_count,
-                "total_files": len(file_schemas),
-            }
-
-    return {
-        "stable_columns": stable_columns,
-        "variable_columns": variable_columns,
-        "total_files": len(file_paths),
-    }
+    # Column names and dtypes only need a sample, not the full sheet
+    return _compare_schemas(
+        [
+            _extract_schema(path, read_excel(path, nrows=SCHEMA_SAMPLE_ROWS))
+            for path in file_paths
+        ]
+    )
 
 
 def compare_data_patterns(file_paths: List[Path]) -> dict:
@@ -112,43 +94,95 @@ def compare_data_patterns(file_paths: List[Path]) -> dict:
     - type_consistent: Boolean if types are consistent
     - unique_count_range: (min, max) unique value counts
     """
-    patterns = defaultdict(
-        lambda: {
-            "null_pcts": [],
-            "types": set(),
-            "unique_counts": [],
+    return _compare_data_patterns([_scan_file(path)[1] for path in file_paths])
+
+
+def _scan_file(path: Path) -> Tuple[dict, dict]:
+    """Read the first sheet of a file and extract its schema and column stats"""
+    df = read_sheet(path)
+    return _extract_schema(path, df), _extract_stats(df)
+
+
+def _extract_schema(path: Path, df: pd.DataFrame) -> dict:
+    """Column names and dtypes of a single file"""
+    return {
+        "path": path,
+        "columns": list(df.columns),
+        "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()},
+    }
+
+
+def _extract_stats(df: pd.DataFrame) -> dict:
+    """Per-column null %, dtype and unique count of a single file"""
+    null_pcts = (df.isna().mean() * 100).to_dict()
+    unique_counts = df.nunique(dropna=True).to_dict()
+    return {
+        col: {
+            "null_pct": null_pcts[col],
+            "dtype": str(dtype),
+            "unique_count": unique_counts[col],
         }
-    )
+        for col, dtype in df.dtypes.items()
+    }
 
-    # Analyze each file
-    for path in file_paths:
-        df = pd.read_excel(path)
 
-        for col in df.columns:
-            null_pct = (df[col].isna().sum() / len(df)) * 100
-            dtype = str(df[col].dtype)
-            unique_count = df[col].nunique()
+def _compare_schemas(file_schemas: List[dict]) -> dict:
+    """Compare per-file schemas (see compare_schemas)"""
+    # Count the files each column appears in, in one pass over all schemas
+    col_counts = Counter()
+    for schema in file_schemas:
+        col_counts.update(schema["columns"])
+    total_files = len(file_schemas)
+
+    # Stable columns are in all files; variable columns are not
+    stable_columns = [col for col, n in col_counts.items() if n == total_files]
+    variable_columns = {
+        col: {"present_in": n, "total_files": total_files}
+        for col, n in col_counts.items()
+        if n < total_files
+    }
+
+    return {
+        "stable_columns": stable_columns,
+        "variable_columns": variable_columns,
+        "total_files": total_files,
+    }
 
-            patterns[col]["null_pcts"].append(null_pct)
-            patterns[col]["types"].add(dtype)
-            patterns[col]["unique_counts"].append(unique_count)
+
+def _compare_data_patterns(file_stats: List[dict]) -> dict:
+    """Compare per-file column stats (see compare_data_patterns)"""
+    # Union of columns in first-seen order, each with a fixed matrix column
+    columns = list(dict.fromkeys(col for stats in file_stats for col in stats))
+    if not columns:
+        return {}
+    col_index = {col: j for j, col in enumerate(columns)}
+
+    # File x column matrices (NaN where a file lacks the column), so min/max
+    # across files is one vectorised reduction per stat
+    null_matrix = np.full((len(file_stats), len(columns)), np.nan)
+    unique_matrix = np.full((len(file_stats), len(columns)), np.nan)
+    types = {col: set() for col in columns}
+    for i, stats in enumerate(file_stats):
+        for col, col_stats in stats.items():
+            j = col_index[col]
+            null_matrix[i, j] = col_stats["null_pct"]
+            unique_matrix[i, j] = col_stats["unique_count"]
+            types[col].add(col_stats["dtype"])
+
+    null_min, null_max = np.nanmin(null_matrix, axis=0), np.nanmax(null_matrix, axis=0)
+    unique_min = np.nanmin(unique_matrix, axis=0)
+    unique_max = np.nanmax(unique_matrix, axis=0)
 
     # Calculate summary statistics
-    result = {}
-    for col, data in patterns.items():
-        null_pcts = data["null_pcts"]
-        result[col] = {
-            "null_pct_range": (min(null_pcts), max(null_pcts)) if null_pcts else (0, 0),
-            "types": data["types"],
-            "type_consistent": len(data["types"]) == 1,
-            "unique_count_range": (
-                (min(data["unique_counts"]), max(data["unique_counts"]))
-                if data["unique_counts"]
-                else (0, 0)
-            ),
+    return {
+        col: {
+            "null_pct_range": (float(null_min[j]), float(null_max[j])),
+            "types": types[col],
+            "type_consistent": len(types[col]) == 1,
+            "unique_count_range": (int(unique_min[j]), int(unique_max[j])),
         }
-
-    return result
+        for col, j in col_index.items()
+    }
 
 
 def _build_multi_month_prompt(
@@ -156,7 +190,7 @@ def _build_multi_month_prompt(
 ) -> str:
     """Build the comprehensive multi-month analysis prompt"""
 
-    prompt = """# Multi-Month Excel Analysis for Anonymization
+    parts = ["""# Multi-Month Excel Analysis for Anonymization
 
 ## Task
 Analyze multiple Excel files across time periods to identify:
@@ -167,89 +201,101 @@ Analyze multiple Excel files across time periods to identify:
 
 ## Files Analyzed
 
-"""
+"""]
 
     # List all files with parsed dates
     for i, info in enumerate(file_info, 1):
         date_str = info["date"].strftime("%Y-%m-%d") if info["date"] else "Unknown"
-        prompt += f"{i}. **{info['name']}**\n"
-        prompt += (
+        parts.append(f"{i}. **{info['name']}**\n")
+        parts.append(
             f"   - Parsed Date: {date_str} (Confidence: {info['date_confidence']})\n"
         )
-        prompt += f"   - Pattern: {info['date_pattern']}\n\n"
+        parts.append(f"   - Pattern: {info['date_pattern']}\n\n")
 
     # Filename pattern analysis
-    prompt += """## Filename Pattern Analysis
+    parts.append("""## Filename Pattern Analysis
 
-"""
+""")
     # Detect if all files follow same pattern
     patterns = [info["date_pattern"] for info in file_info]
-    unique_patterns = set(patterns)
+    pattern_counts = Counter(patterns)
 
-    if len(unique_patterns) == 1 and "No date found" not in patterns[0]:
-        prompt += f"- **Detected Pattern**: {patterns[0]}\n"
-        prompt += f"- **Date Parsing**: {len([p for p in patterns if 'No date' not in p])}/{len(patterns)} successful\n"
-        prompt += "- **Consistency**: High (all files follow same pattern)\n"
-        prompt += (
+    if len(pattern_counts) == 1 and "No date found" not in patterns[0]:
+        parts.append(f"- **Detected Pattern**: {patterns[0]}\n")
+        parts.append(
+            f"- **Date Parsing**: {len([p for p in patterns if 'No date' not in p])}/{len(patterns)} successful\n"
+        )
+        parts.append("- **Consistency**: High (all files follow same pattern)\n")
+        parts.append(
             "- **Recommendation**: This pattern is reliable for date extraction\n\n"
         )
     else:
-        prompt += "- **Consistency**: Low (multiple patterns detected)\n"
-        prompt += "- **Patterns Found**:\n"
-        for pattern in unique_patterns:
-            count = patterns.count(pattern)
-            prompt += f"  - {pattern} ({count} file{'s' if count > 1 else ''})\n"
-        prompt += "\n"
+        parts.append("- **Consistency**: Low (multiple patterns detected)\n")
+        parts.append("- **Patterns Found**:\n")
+        for pattern, count in pattern_counts.most_common():
+            parts.append(f"  - {pattern} ({count} file{'s' if count > 1 else ''})\n")
+        parts.append("\n")
 
     # Schema stability
-    prompt += """## Schema Stability Report
+    parts.append("""## Schema Stability Report
 
 ### Stable Columns (present in all files)
 
-"""
+""")
 
-    stable_cols = schema_comparison["stable_columns"]
+    stable_cols = sorted(schema_comparison["stable_columns"])
+    stable_set = set(stable_cols)
+    not_null_candidates = []
+    always_null_cols = []
     if stable_cols:
-        prompt += "The following columns appear in ALL files:\n\n"
-        for col in sorted(stable_cols):
+        parts.append("The following columns appear in ALL files:\n\n")
+        for col in stable_cols:
             # Add data pattern info
-            pattern = data_patterns.get(col, {})
-            null_range = pattern.get("null_pct_range", (0, 0))
-            type_consistent = pattern.get("type_consistent", True)
+            pattern = data_patterns.get(col)
+            if pattern is None:
+                continue
+            null_min, null_max = pattern["null_pct_range"]
+            type_consistent = pattern["type_consistent"]
 
-            status = "✅" if type_consistent and null_range[1] < 100 else "⚠️"
-            prompt += f"- {status} **{col}**\n"
+            status = "✅" if type_consistent and null_max < 100 else "⚠️"
+            parts.append(f"- {status} **{col}**\n")
 
-            if null_range[0] == null_range[1]:
-                prompt += f"  - Null: {null_range[0]:.1f}%\n"
+            if null_min == null_max:
+                parts.append(f"  - Null: {null_min:.1f}%\n")
             else:
-                prompt += (
-                    f"  - Null range: {null_range[0]:.1f}% - {null_range[1]:.1f}%\n"
-                )
+                parts.append(f"  - Null range: {null_min:.1f}% - {null_max:.1f}%\n")
 
             if not type_consistent:
-                types_str = ", ".join(pattern.get("types", set()))
-                prompt += f"  - ⚠️ Type inconsistency: {types_str}\n"
+                types_str = ", ".join(pattern["types"])
+                parts.append(f"  - ⚠️ Type inconsistency: {types_str}\n")
 
             # Flag always-null columns
-            if null_range[0] == 100 and null_range[1] == 100:
-                prompt += "  - ⚠️ **ALWAYS NULL** - candidate for removal\n"
+            if null_min == 100 and null_max == 100:
+                parts.append("  - ⚠️ **ALWAYS NULL** - candidate for removal\n")
 
-            prompt += "\n"
+            parts.append("\n")
+
+            # Collect validation candidates in the same pass
+            if null_max == 0:
+                not_null_candidates.append(col)
+            if null_min == 100:
+                always_null_cols.append(col)
     else:
-        prompt += "No columns are present in all files.\n\n"
+        parts.append("No columns are present in all files.\n\n")
 
     # Variable columns
     var_cols = schema_comparison["variable_columns"]
     if var_cols:
-        prompt += """### Variable Columns (not in all files)
+        parts.append("""### Variable Columns (not in all files)
 
-"""
+""")
         for col, info in sorted(var_cols.items()):
-            prompt += f"- **{col}**: Present in {info['present_in']}/{info['total_files']} files\n"
+            parts.append(
+                f"- **{col}**: Present in {info['present_in']}/{info['total_files']} files\n"
+            )
 
     # Validation recommendations
-    prompt += """
+    parts.append("""
 
 
 ## Validation Rule Recommendations
@@ -258,107 +304,95 @@ Based on multi-month stability analysis:
 
 ### High Confidence Rules
 ✅ **NotNullRule candidates**: Columns with 0% null across ALL files
-"""
-
-    # Find columns with 0% null in all files
-    not_null_candidates = [
-        col
-        for col in stable_cols
-        if data_patterns.get(col, {}).get("null_pct_range", (100, 100))[1] == 0
-    ]
+""")
 
     if not_null_candidates:
-        prompt += "\n```python\nNotNullRule(columns=[\n"
-        for col in sorted(not_null_candidates):
-            prompt += f'    "{col}",\n'
-        prompt += "])\n```\n"
+        parts.append("\n```python\nNotNullRule(columns=[\n")
+        for col in not_null_candidates:
+            parts.append(f'    "{col}",\n')
+        parts.append("])\n```\n")
     else:
-        prompt += "\n(No columns with 0% null in all files)\n"
-
-    # Flag always-null columns
-    always_null_cols = [
-        col
-        for col in stable_cols
-        if data_patterns.get(col, {}).get("null_pct_range", (0, 0))[0] == 100
-    ]
+        parts.append("\n(No columns with 0% null in all files)\n")
 
     if always_null_cols:
-        prompt += """
+        parts.append("""
 ### ❌ DO NOT use NotNullRule on these columns
 The following columns are 100% null in ALL files (candidates for removal):
 
-"""
-        for col in sorted(always_null_cols):
-            prompt += f"- **{col}**\n"
+""")
+        for col in always_null_cols:
+            parts.append(f"- **{col}**\n")
 
     # Data quality issues
-    prompt += """
+    parts.append("""
 
 
 ## Data Quality Issues Detected
 
-"""
+""")
 
     # Find type inconsistencies
     type_issues = [
         (col, pattern)
         for col, pattern in data_patterns.items()
-        if not pattern.get("type_consistent", True) and col in stable_cols
+        if not pattern["type_consistent"] and col in stable_set
     ]
 
     if type_issues:
         for col, pattern in type_issues:
             types_str = ", ".join(pattern["types"])
-            prompt += f"1. **Type inconsistency in {col}**: {types_str}\n"
-            prompt += "   - Recommendation: Add type coercion in transform()\n\n"
+            parts.append(f"1. **Type inconsistency in {col}**: {types_str}\n")
+            parts.append("   - Recommendation: Add type coercion in transform()\n\n")
 
     # Find null percentage changes
     null_variance = [
         (col, pattern)
         for col, pattern in data_patterns.items()
-        if col in stable_cols
-        and abs(pattern["null_pct_range"][1] - pattern["null_pct_range"][0]) > 30
+        if col in stable_set
+        and pattern["null_pct_range"][1] - pattern["null_pct_range"][0] > 30
     ]
 
     if null_variance:
         for col, pattern in null_variance:
             null_min, null_max = pattern["null_pct_range"]
-            prompt += f"2. **Null percentage variance in {col}**: {null_min:.1f}% to {null_max:.1f}%\n"
-            prompt += "   - Recommendation: Column population is inconsistent\n\n"
+            parts.append(
+                f"2. **Null percentage variance in {col}**: {null_min:.1f}% to {null_max:.1f}%\n"
+            )
+            parts.append("   - Recommendation: Column population is inconsistent\n\n")
 
     if not type_issues and not null_variance:
-        prompt += "No major data quality issues detected.\n"
+        parts.append("No major data quality issues detected.\n")
 
-    prompt += """
+    parts.append("""
 
 
 ## Summary
 
 **✅ Stable (safe to rely on):**
-"""
-    for col in sorted(stable_cols)[:5]:  # Show top 5
-        prompt += f"\n- {col}"
+""")
+    for col in stable_cols[:5]:  # Show top 5
+        parts.append(f"\n- {col}")
 
     if len(stable_cols) > 5:
-        prompt += f"\n- ... and {len(stable_cols) - 5} more stable columns"
+        parts.append(f"\n- ... and {len(stable_cols) - 5} more stable columns")
 
     if var_cols:
-        prompt += """
+        parts.append("""
 
 **⚠️ Variable (need flexible handling):**
-"""
+""")
         for col in sorted(var_cols.keys())[:3]:  # Show top 3
-            prompt += f"\n- {col}"
+            parts.append(f"\n- {col}")
 
     if always_null_cols:
-        prompt += """
+        parts.append("""
 
 **❌ Never Used (candidates for removal):**
-"""
-        for col in sorted(always_null_cols):
-            prompt += f"\n- {col}"
+""")
+        for col in always_null_cols:
+            parts.append(f"\n- {col}")
 
-    prompt += """
+    parts.append("""
 
 ## Recommendation
 
@@ -367,6 +401,6 @@ Build processor with flexible validation:
 - Allow for schema variations in variable columns
 - Transform step to normalize format inconsistencies
 - Warning (not error) for columns that vary in population
-"""
+""")
 
-    return prompt
+    return "".join(parts)
@@ -0,0 +1,25 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _load_config(path: Path) -> dict:
+    spec = importlib.util.spec_from_file_location("cfg", path)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod.config
+
+
+@pytest.fixture(scope="session")
+def revenue_config():
+    """Config dict from fixtures/revenue_report_config.py, loaded once."""
+    return _load_config(FIXTURES / "revenue_report_config.py")
+
+
+@pytest.fixture(scope="session")
+def team_config():
+    """Config dict from fixtures/team_roster_config.py, loaded once."""
+    return _load_config(FIXTURES / "team_roster_config.py")
@@ -10,13 +10,56 @@ Fixtures:
     tests/fixtures/2024-Q4 Team Roster.xlsx    - Single-sheet employee data
 """
 
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-import pandas as pd
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment
+from openpyxl.utils import get_column_letter
 
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
+# Shared by every header cell; openpyxl style objects are immutable
+HEADER_FONT = Font(bold=True, color="FFFFFF")
+HEADER_FILL = PatternFill(start_color="1F4E79", end_color="1F4E79", fill_type="solid")
+CENTER_ALIGN = Alignment(horizontal="center")
+TOTAL_FONT = Font(bold=True)
+
+
+def _styled_row(ws, values, font, fill=None, alignment=None):
+    """Row of write-only cells that all share the given styles"""
+    cells = []
+    for value in values:
+        cell = WriteOnlyCell(ws, value=value)
+        cell.font = font
+        if fill is not None:
+            cell.fill = fill
+        if alignment is not None:
+            cell.alignment = alignment
+        cells.append(cell)
+    return cells
+
+
+def _append_table(ws, rows, bold_last=False):
+    """
+    Append a styled header row followed by the data rows.
+
+    Styles are attached to the cells before they are written, so no row is
+    revisited. With bold_last, the final row (e.g. totals) is bold.
+    """
+    ws.append(_styled_row(ws, rows[0], HEADER_FONT, HEADER_FILL, CENTER_ALIGN))
+    body = rows[1:-1] if bold_last else rows[1:]
+    for row in body:
+        ws.append(row)
+    if bold_last:
+        ws.append(_styled_row(ws, rows[-1], TOTAL_FONT))
+
+
+def _set_widths(ws, widths):
+    """Set column widths left to right, starting at column A"""
+    for i, width in enumerate(widths, 1):
+        ws.column_dimensions[get_column_letter(i)].width = width
+
 
 def create_revenue_report():
     """
@@ -35,11 +78,12 @@ def create_revenue_report():
         - Mix of entity types: PERSON, ORGANIZATION, PROJECT_NAME, EMAIL_ADDRESS, PHONE_NUMBER
         - Null values in optional Description column
     """
-    wb = Workbook()
+    # Write-only mode streams rows straight to XML instead of building a
+    # cell grid; column widths must be set before the first append
+    wb = Workbook(write_only=True)
 
     # --- Sheet 1: Summary ---
-    ws_summary = wb.active
-    ws_summary.title = "Summary"
+    ws_summary = wb.create_sheet("Summary")
 
     summary_data = [
         ["Client", "Account Manager", "Revenue", "Cost", "Gross Margin", "GM%"],
@@ -56,27 +100,11 @@ def create_revenue_report():
         ["Total", "", 1322800.00, 930770.00, 392030.00, 29.64],
     ]
 
-    for row in summary_data:
-        ws_summary.append(row)
-
-    # Header styling
-    header_fill = PatternFill(
-        start_color="1F4E79", end_color="1F4E79", fill_type="solid"
-    )
-    for cell in ws_summary[1]:
-        cell.font = Font(bold=True, color="FFFFFF")
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal="center")
-
-    # Bold the totals row
-    for cell in ws_summary[len(summary_data) + 1]:
-        cell.font = Font(bold=True)
-
     # Column widths
-    ws_summary.column_dimensions["A"].width = 22
-    ws_summary.column_dimensions["B"].width = 18
-    for col in ["C", "D", "E", "F"]:
-        ws_summary.column_dimensions[col].width = 16
+    _set_widths(ws_summary, [22, 18, 16, 16, 16, 16])
+
+    # Styled header, then data, then the bold totals row
+    _append_table(ws_summary, summary_data, bold_last=True)
 
     # --- Sheet 2: Details ---
     ws_details = wb.create_sheet("Details")
@@ -249,22 +277,9 @@ def create_revenue_report():
         ],
     ]
 
-    for row in details_data:
-        ws_details.append(row)
-
-    for cell in ws_details[1]:
-        cell.font = Font(bold=True, color="FFFFFF")
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal="center")
+    _set_widths(ws_details, [30, 22, 18, 45, 14, 14, 14, 14, 14])
 
-    ws_details.column_dimensions["A"].width = 30
-    ws_details.column_dimensions["B"].width = 22
-    ws_details.column_dimensions["C"].width = 18
-    ws_details.column_dimensions["D"].width = 45
-    for col in ["E", "F"]:
-        ws_details.column_dimensions[col].width = 14
-    for col in ["G", "H", "I"]:
-        ws_details.column_dimensions[col].width = 14
+    _append_table(ws_details, details_data)
 
     # --- Sheet 3: Team ---
     ws_team = wb.create_sheet("Team")
@@ -308,19 +323,9 @@ def create_revenue_report():
         ],
     ]
 
-    for row in team_data:
-        ws_team.append(row)
+    _set_widths(ws_team, [18, 24, 34, 14, 20])
 
-    for cell in ws_team[1]:
-        cell.font = Font(bold=True, color="FFFFFF")
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal="center")
-
-    ws_team.column_dimensions["A"].width = 18
-    ws_team.column_dimensions["B"].width = 24
-    ws_team.column_dimensions["C"].width = 34
-    ws_team.column_dimensions["D"].width = 14
-    ws_team.column_dimensions["E"].width = 20
+    _append_table(ws_team, team_data)
 
     output_path = FIXTURES_DIR / "Dec-24 Revenue Report.xlsx"
     wb.save(output_path)
@@ -549,30 +554,24 @@ def create_team_roster():
         ],
     }
 
-    df = pd.DataFrame(data)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Roster")
 
-    output_path = FIXTURES_DIR / "2024-Q4 Team Roster.xlsx"
-    with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
-        df.to_excel(writer, sheet_name="Roster", index=False)
-
-        ws = writer.sheets["Roster"]
-        header_fill = PatternFill(
-            start_color="1F4E79", end_color="1F4E79", fill_type="solid"
-        )
-        for cell in ws[1]:
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = header_fill
-            cell.alignment = Alignment(horizontal="center")
-
-        col_widths = [12, 12, 16, 20, 14, 22, 28, 12, 18, 12, 14, 10, 14]
-        for i, width in enumerate(col_widths, 1):
-            ws.column_dimensions[ws.cell(1, i).column_letter].width = width
+    _set_widths(ws, [12, 12, 16, 20, 14, 22, 28, 12, 18, 12, 14, 10, 14])
+
+    # data is column-major; zip turns it into rows
+    _append_table(ws, [list(data), *zip(*data.values())])
 
+    output_path = FIXTURES_DIR / "2024-Q4 Team Roster.xlsx"
+    wb.save(output_path)
     print(f"Created: {output_path}")
 
 
 if __name__ == "__main__":
     FIXTURES_DIR.mkdir(parents=True, exist_ok=True)
-    create_revenue_report()
-    create_team_roster()
+    # The workbooks share nothing, so build them in parallel
+    builders = [create_revenue_report, create_team_roster]
+    with ProcessPoolExecutor(max_workers=len(builders)) as pool:
+        for future in [pool.submit(build) for build in builders]:
+            future.result()
     print("Done.")
@@ -49,3 +49,14 @@ def test_to_dict_counts_mappings():
     mapper.get_or_create("ORGANIZATION", "Acme")
     report = mapper.to_dict()
     assert report["total_mappings"] == 3
+
+
+def test_bulk_get_or_create_matches_one_at_a_time():
+    values = ["Alice", "Bob", "Alice", "Carol"]
+    single = EntityMapper(seed=42)
+    expected = [single.get_or_create("PERSON", v) for v in values]
+
+    bulk = EntityMapper(seed=42)
+    assert bulk.bulk_get_or_create("PERSON", values) == expected
+    assert bulk.bulk_get_or_create("CUSTOM", []) == []
+    assert "CUSTOM" not in bulk.mappings
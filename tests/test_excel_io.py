@@ -0,0 +1,143 @@
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+from pathlib import Path
+from sheetmask import excel_io
+
+REVENUE_REPORT = Path(__file__).parent / "fixtures" / "Dec-24 Revenue Report.xlsx"
+
+
+def test_read_excel_matches_openpyxl():
+    expected = pd.read_excel(REVENUE_REPORT, sheet_name=None, engine="openpyxl")
+    result = excel_io.read_excel(REVENUE_REPORT, sheet_name=None)
+    assert result.keys() == expected.keys()
+    for name, df in expected.items():
+        pd.testing.assert_frame_equal(result[name], df)
+
+
+def test_calamine_needs_pandas_2_2(monkeypatch):
+    monkeypatch.setattr(excel_io.importlib.util, "find_spec", lambda name: object())
+    monkeypatch.setattr(excel_io.pd, "__version__", "2.1.4")
+    assert not excel_io._calamine_available()
+    monkeypatch.setattr(excel_io.pd, "__version__", "2.2.0rc0")
+    assert excel_io._calamine_available()
+
+
+def test_read_excel_falls_back_without_calamine(monkeypatch):
+    monkeypatch.setattr(excel_io, "ENGINE", None)
+    df = excel_io.read_excel(REVENUE_REPORT, sheet_name="Summary")
+    assert "Revenue" in df.columns
+    assert excel_io.open_workbook(REVENUE_REPORT).sheet_names == [
+        "Summary",
+        "Details",
+        "Team",
+    ]
+
+
+def test_read_sheet_uncached_by_default(monkeypatch, mocker):
+    monkeypatch.delenv(excel_io.CACHE_DIR_ENV, raising=False)
+    spy = mocker.spy(excel_io, "read_excel")
+    excel_io.read_sheet(REVENUE_REPORT, "Summary")
+    excel_io.read_sheet(REVENUE_REPORT, "Summary")
+    assert spy.call_count == 2
+
+
+def test_read_sheet_cache_hit_skips_excel(tmp_path, monkeypatch, mocker):
+    monkeypatch.setenv(excel_io.CACHE_DIR_ENV, str(tmp_path))
+    spy = mocker.spy(excel_io, "read_excel")
+    first = excel_io.read_sheet(REVENUE_REPORT, "Details")
+    second = excel_io.read_sheet(REVENUE_REPORT, "Details")
+    assert spy.call_count == 1
+    pd.testing.assert_frame_equal(second, first)
+
+
+def test_read_sheet_skips_cache_for_unstorable_sheet(tmp_path, monkeypatch, mocker):
+    monkeypatch.setenv(excel_io.CACHE_DIR_ENV, str(tmp_path))
+    mixed = pd.DataFrame({"Code": [1, "A-2", 3.5]})
+    mocker.patch.object(excel_io, "read_excel", return_value=mixed)
+    df = excel_io.read_sheet(REVENUE_REPORT, "Summary")
+    pd.testing.assert_frame_equal(df, mixed)
+    assert not list(tmp_path.rglob("*.parquet"))
+
+
+def test_read_sheet_head_counts_rows_beyond_head():
+    full = excel_io.read_excel(REVENUE_REPORT, sheet_name="Details")
+    with excel_io.open_workbook(REVENUE_REPORT) as xls:
+        head, row_count = excel_io.read_sheet_head(xls, "Details", nrows=3)
+    assert len(head) == 3
+    assert row_count == len(full)
+    pd.testing.assert_frame_equal(head, full.head(3))
+
+
+@pytest.mark.parametrize("engine", ["calamine", "openpyxl"])
+def test_read_sheet_head_counts_leading_blank_rows(tmp_path, monkeypatch, engine):
+    path = tmp_path / "leading_blanks.xlsx"
+    workbook = Workbook()
+    workbook.active.append([])
+    workbook.active.append([])
+    workbook.active.append(["Name", "Amount"])
+    for i in range(20):
+        workbook.active.append([f"row {i}", i])
+    workbook.save(path)
+
+    monkeypatch.setattr(excel_io, "ENGINE", engine)
+    full = excel_io.read_excel(path)
+    with excel_io.open_workbook(path) as xls:
+        _, row_count = excel_io.read_sheet_head(xls, 0, nrows=3)
+    assert row_count == len(full) == 22
+
+
+def test_read_sheet_head_small_sheet_is_exact():
+    with excel_io.open_workbook(REVENUE_REPORT) as xls:
+        head, row_count = excel_io.read_sheet_head(xls, "Team", nrows=1000)
+    assert row_count == len(head) == 5
+
+
+def test_read_sheet_head_counts_rows_with_openpyxl(monkeypatch):
+    monkeypatch.setattr(excel_io, "ENGINE", "openpyxl")
+    with excel_io.open_workbook(REVENUE_REPORT) as xls:
+        head, row_count = excel_io.read_sheet_head(xls, "Details", nrows=3)
+    assert len(head) == 3
+    assert row_count == 14
+
+
+def test_write_sheets_round_trips_like_to_excel(tmp_path):
+    sheets = pd.read_excel(REVENUE_REPORT, sheet_name=None, engine="openpyxl")
+    sheets["Gaps"] = pd.DataFrame(
+        {
+            "Name": ["Acme", None, "Beta"],
+            "Amount": [1.5, float("nan"), 3.0],
+            "Count": [1, 2, 3],
+            "When": pd.to_datetime(["2024-01-31", None, "2024-03-31"]),
+        }
+    )
+    written = tmp_path / "out.xlsx"
+    expected = tmp_path / "expected.xlsx"
+    excel_io.write_sheets(written, sheets)
+    with pd.ExcelWriter(expected, engine="openpyxl") as writer:
+        for name, df in sheets.items():
+            df.to_excel(writer, sheet_name=name, index=False)
+
+    got = pd.read_excel(written, sheet_name=None, engine="openpyxl")
+    want = pd.read_excel(expected, sheet_name=None, engine="openpyxl")
+    assert list(got) == list(want)
+    for name in want:
+        pd.testing.assert_frame_equal(got[name], want[name])
+
+
+def test_write_sheets_keeps_header_types(tmp_path):
+    df = pd.DataFrame(
+        {
+            2024: [1, 2],
+            pd.Timestamp("2024-12-31"): [3.5, 4.5],
+            "Units": pd.array([1, None], dtype="Int64"),
+        }
+    )
+    written = tmp_path / "out.xlsx"
+    expected = tmp_path / "expected.xlsx"
+    excel_io.write_sheets(written, {"Sheet1": df})
+    df.to_excel(expected, index=False)
+
+    got = pd.read_excel(written, engine="openpyxl")
+    pd.testing.assert_frame_equal(got, pd.read_excel(expected, engine="openpyxl"))
+    assert list(got.columns) == [2024, pd.Timestamp("2024-12-31"), "Units"]
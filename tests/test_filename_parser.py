@@ -1,4 +1,6 @@
+from dataclasses import FrozenInstanceError
 from datetime import date
+import pytest
 from sheetmask.filename_parser import parse_date_from_filename
 
 
@@ -23,3 +25,22 @@ def test_no_date_returns_none():
     result = parse_date_from_filename("my_report.xlsx")
     assert result.date is None
     assert result.confidence == "None"
+
+
+def test_higher_confidence_format_wins_over_earlier_position():
+    result = parse_date_from_filename("2023 backlog Dec-24.xlsx")
+    assert result.date == date(2024, 12, 1)
+    assert result.pattern == "Month-YY"
+
+
+def test_unresolvable_ambiguous_date_falls_back_to_year():
+    result = parse_date_from_filename("13-13-2024 export.xlsx")
+    assert result.date == date(2024, 1, 1)
+    assert result.pattern == "Year only"
+
+
+def test_repeat_parses_return_cached_result():
+    first = parse_date_from_filename("Nov-24 Forecast.xlsx")
+    assert parse_date_from_filename("Nov-24 Forecast.xlsx") is first
+    with pytest.raises(FrozenInstanceError):
+        first.confidence = "Low"
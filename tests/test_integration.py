@@ -5,11 +5,17 @@ These tests run the full anonymization pipeline on complex,
 multi-sheet Excel files to catch issues that unit tests miss.
 """
 
+import json
+import zipfile
+import xml.etree.ElementTree as ET
 import pandas as pd
+import pytest
 from pathlib import Path
 from typer.testing import CliRunner
 from sheetmask.cli import app
+from sheetmask.excel_io import read_excel
 from sheetmask.executor import AnonymizationExecutor
+from sheetmask.rules import PercentageVarianceRule, PreserveRelationshipRule
 
 runner = CliRunner()
 
@@ -20,11 +26,57 @@ REVENUE_CONFIG = FIXTURES / "revenue_report_config.py"
 TEAM_CONFIG = FIXTURES / "team_roster_config.py"
 
 
+def _sheet_names(path):
+    """Sheet names in workbook order, read straight from xl/workbook.xml"""
+    with zipfile.ZipFile(path) as archive:
+        root = ET.fromstring(archive.read("xl/workbook.xml"))
+    return [sheet.get("name") for sheet in root.iterfind(".//{*}sheet")]
+
+
+def _workbook_parts(path):
+    """Contents of every xl/ part (sheets, shared strings, styles) by name"""
+    with zipfile.ZipFile(path) as archive:
+        return {
+            name: archive.read(name)
+            for name in archive.namelist()
+            if name.startswith("xl/")
+        }
+
+
+@pytest.fixture(scope="session")
+def original_revenue_sheets():
+    """Unmodified revenue report, parsed once; tests must not mutate it."""
+    return read_excel(REVENUE_REPORT, sheet_name=None)
+
+
+@pytest.fixture(scope="session")
+def original_roster_sheets():
+    """Unmodified team roster, parsed once; tests must not mutate it."""
+    return read_excel(TEAM_ROSTER, sheet_name=None)
+
+
 # --- Revenue Report: multi-sheet, financial relationships ---
 
 
+@pytest.fixture(scope="class")
+def revenue_output(tmp_path_factory, revenue_config):
+    """Anonymize the report once; the tests below only read the result."""
+    output = tmp_path_factory.mktemp("rev") / "output.xlsx"
+    executor = AnonymizationExecutor(revenue_config, seed=42)
+    executor.anonymize_file(REVENUE_REPORT, output, auto_suffix=False)
+    return output
+
+
+@pytest.fixture(scope="class")
+def revenue_sheets(revenue_output):
+    return read_excel(revenue_output, sheet_name=None)
+
+
+@pytest.mark.xdist_group(name="revenue_report")
+@pytest.mark.xlsx
 class TestRevenueReport:
     def test_all_three_sheets_processed(self, tmp_path):
+        """Smoke test through the CLI; the other tests share one executor run."""
         output = tmp_path / "output.xlsx"
         result = runner.invoke(
             app,
@@ -39,24 +91,10 @@ class TestRevenueReport:
             ],
         )
         assert result.exit_code == 0, result.output
-        xls = pd.ExcelFile(output)
-        assert set(xls.sheet_names) == {"Summary", "Details", "Team"}
+        assert set(_sheet_names(output)) == {"Summary", "Details", "Team"}
 
-    def test_client_names_anonymized(self, tmp_path):
-        output = tmp_path / "output.xlsx"
-        runner.invoke(
-            app,
-            [
-                "process",
-                str(REVENUE_REPORT),
-                str(output),
-                "--config",
-                str(REVENUE_CONFIG),
-                "--seed",
-                "42",
-            ],
-        )
-        df = pd.read_excel(output, sheet_name="Summary")
+    def test_client_names_anonymized(self, revenue_sheets):
+        df = revenue_sheets["Summary"]
         original_clients = {
             "Northgate Industries",
             "Apex Solutions LLC",
@@ -74,43 +112,19 @@ class TestRevenueReport:
             anonymized_clients
         ), "Some original client names were not anonymized"
 
-    def test_person_names_anonymized(self, tmp_path):
-        output = tmp_path / "output.xlsx"
-        runner.invoke(
-            app,
-            [
-                "process",
-                str(REVENUE_REPORT),
-                str(output),
-                "--config",
-                str(REVENUE_CONFIG),
-                "--seed",
-                "42",
-            ],
-        )
-        df = pd.read_excel(output, sheet_name="Summary")
+    def test_person_names_anonymized(self, revenue_sheets):
+        df = revenue_sheets["Summary"]
         original_managers = {"Sarah Chen", "Marcus Webb", "Jordan Hayes"}
         anonymized_managers = set(df["Account Manager"].dropna())
         assert not original_managers.intersection(anonymized_managers)
 
-    def test_gross_margin_equals_revenue_minus_cost(self, tmp_path):
+    def test_gross_margin_equals_revenue_minus_cost(self, revenue_sheets):
         """GM = Revenue - Cost must hold after anonymization."""
-        output = tmp_path / "output.xlsx"
-        runner.invoke(
-            app,
-            [
-                "process",
-                str(REVENUE_REPORT),
-                str(output),
-                "--config",
-                str(REVENUE_CONFIG),
-                "--seed",
-                "42",
-            ],
-        )
-        df = pd.read_excel(output, sheet_name="Summary")
+        df = revenue_sheets["Summary"]
         # Exclude the totals row (empty Account Manager)
-        data = df[df["Account Manager"].notna()].copy()
+        data = df.loc[
+            df["Account Manager"].notna(), ["Revenue", "Cost", "Gross Margin"]
+        ]
         expected_gm = (data["Revenue"] - data["Cost"]).round(2)
         pd.testing.assert_series_equal(
             data["Gross Margin"].round(2),
@@ -118,23 +132,10 @@ class TestRevenueReport:
             check_names=False,
         )
 
-    def test_gm_percent_derived_from_anonymized_values(self, tmp_path):
+    def test_gm_percent_derived_from_anonymized_values(self, revenue_sheets):
         """GM% = (GM / Revenue) * 100 must hold after anonymization."""
-        output = tmp_path / "output.xlsx"
-        runner.invoke(
-            app,
-            [
-                "process",
-                str(REVENUE_REPORT),
-                str(output),
-                "--config",
-                str(REVENUE_CONFIG),
-                "--seed",
-                "42",
-            ],
-        )
-        df = pd.read_excel(output, sheet_name="Summary")
-        data = df[df["Account Manager"].notna()].copy()
+        df = revenue_sheets["Summary"]
+        data = df.loc[df["Account Manager"].notna(), ["Revenue", "Gross Margin", "GM%"]]
         expected_pct = (data["Gross Margin"] / data["Revenue"] * 100).round(2)
         pd.testing.assert_series_equal(
             data["GM%"].round(2),
@@ -142,23 +143,10 @@ class TestRevenueReport:
             check_names=False,
         )
 
-    def test_entity_consistent_across_sheets(self, tmp_path):
+    def test_entity_consistent_across_sheets(self, revenue_sheets):
         """Same person in Summary and Team sheets should map to the same fake name."""
-        output = tmp_path / "output.xlsx"
-        runner.invoke(
-            app,
-            [
-                "process",
-                str(REVENUE_REPORT),
-                str(output),
-                "--config",
-                str(REVENUE_CONFIG),
-                "--seed",
-                "42",
-            ],
-        )
-        summary_df = pd.read_excel(output, sheet_name="Summary")
-        team_df = pd.read_excel(output, sheet_name="Team")
+        summary_df = revenue_sheets["Summary"]
+        team_df = revenue_sheets["Team"]
 
         summary_managers = set(summary_df["Account Manager"].dropna())
         team_names = set(team_df["Name"].dropna())
@@ -169,107 +157,47 @@ class TestRevenueReport:
             f"{summary_managers - team_names}"
         )
 
-    def test_null_descriptions_preserved(self, tmp_path):
+    def test_null_descriptions_preserved(self, revenue_sheets, original_revenue_sheets):
         """Null values in Description column should remain null."""
-        output = tmp_path / "output.xlsx"
-        runner.invoke(
-            app,
-            [
-                "process",
-                str(REVENUE_REPORT),
-                str(output),
-                "--config",
-                str(REVENUE_CONFIG),
-                "--seed",
-                "42",
-            ],
-        )
-        original_df = pd.read_excel(REVENUE_REPORT, sheet_name="Details")
-        output_df = pd.read_excel(output, sheet_name="Details")
+        original_df = original_revenue_sheets["Details"]
+        output_df = revenue_sheets["Details"]
 
         original_nulls = original_df["Description"].isna()
         output_nulls = output_df["Description"].isna()
         pd.testing.assert_series_equal(original_nulls, output_nulls, check_names=False)
 
-    def test_dates_preserved(self, tmp_path):
+    def test_dates_preserved(self, revenue_sheets, original_revenue_sheets):
         """Start Date and End Date columns must not be modified."""
-        output = tmp_path / "output.xlsx"
-        runner.invoke(
-            app,
-            [
-                "process",
-                str(REVENUE_REPORT),
-                str(output),
-                "--config",
-                str(REVENUE_CONFIG),
-                "--seed",
-                "42",
-            ],
-        )
-        original_df = pd.read_excel(REVENUE_REPORT, sheet_name="Details")
-        output_df = pd.read_excel(output, sheet_name="Details")
+        original_df = original_revenue_sheets["Details"]
+        output_df = revenue_sheets["Details"]
         pd.testing.assert_series_equal(
             original_df["Start Date"], output_df["Start Date"], check_names=False
         )
 
-    def test_output_is_reproducible(self, tmp_path):
+    def test_output_is_reproducible(self, tmp_path, revenue_config):
         """Two runs with same seed must produce identical output."""
         out1 = tmp_path / "out1.xlsx"
         out2 = tmp_path / "out2.xlsx"
         for out in [out1, out2]:
-            runner.invoke(
-                app,
-                [
-                    "process",
-                    str(REVENUE_REPORT),
-                    str(out),
-                    "--config",
-                    str(REVENUE_CONFIG),
-                    "--seed",
-                    "99",
-                ],
-            )
-        df1 = pd.read_excel(out1, sheet_name="Summary")
-        df2 = pd.read_excel(out2, sheet_name="Summary")
-        pd.testing.assert_frame_equal(df1, df2)
-
-    def test_revenue_values_changed(self, tmp_path):
+            executor = AnonymizationExecutor(revenue_config, seed=99)
+            executor.anonymize_file(REVENUE_REPORT, out, auto_suffix=False)
+        # Whole-file bytes differ by the save timestamps (zip entries and
+        # docProps/core.xml); the workbook parts under xl/ must match exactly
+        assert _workbook_parts(out1) == _workbook_parts(out2)
+
+    def test_revenue_values_changed(self, revenue_sheets, original_revenue_sheets):
         """Revenue values must differ from originals after anonymization."""
-        output = tmp_path / "output.xlsx"
-        runner.invoke(
-            app,
-            [
-                "process",
-                str(REVENUE_REPORT),
-                str(output),
-                "--config",
-                str(REVENUE_CONFIG),
-                "--seed",
-                "42",
-            ],
-        )
-        original_df = pd.read_excel(REVENUE_REPORT, sheet_name="Summary")
-        output_df = pd.read_excel(output, sheet_name="Summary")
+        original_df = original_revenue_sheets["Summary"]
+        output_df = revenue_sheets["Summary"]
         data_rows = original_df[original_df["Account Manager"].notna()]
         out_rows = output_df[output_df["Account Manager"].notna()]
         assert not data_rows["Revenue"].equals(out_rows["Revenue"])
 
-    def test_emails_anonymized_in_team_sheet(self, tmp_path):
-        output = tmp_path / "output.xlsx"
-        runner.invoke(
-            app,
-            [
-                "process",
-                str(REVENUE_REPORT),
-                str(output),
-                "--config",
-                str(REVENUE_CONFIG),
-                "--seed",
-                "42",
-            ],
-        )
-        original_df = pd.read_excel(REVENUE_REPORT, sheet_name="Team")
-        output_df = pd.read_excel(output, sheet_name="Team")
+    def test_emails_anonymized_in_team_sheet(
+        self, revenue_sheets, original_revenue_sheets
+    ):
+        original_df = original_revenue_sheets["Team"]
+        output_df = revenue_sheets["Team"]
         original_emails = set(original_df["Email"])
         output_emails = set(output_df["Email"])
         assert not original_emails.intersection(output_emails)
@@ -278,8 +206,25 @@ class TestRevenueReport:
 # --- Team Roster: single-sheet, multiple entity types, nulls ---
 
 
+@pytest.fixture(scope="class")
+def roster_output(tmp_path_factory, team_config):
+    """Anonymize the roster once; the tests below only read the result."""
+    output = tmp_path_factory.mktemp("roster") / "output.xlsx"
+    executor = AnonymizationExecutor(team_config, seed=42)
+    executor.anonymize_file(TEAM_ROSTER, output, auto_suffix=False)
+    return output
+
+
+@pytest.fixture(scope="class")
+def roster_sheets(roster_output):
+    return read_excel(roster_output, sheet_name=None)
+
+
+@pytest.mark.xdist_group(name="team_roster")
+@pytest.mark.xlsx
 class TestTeamRoster:
     def test_single_sheet_processed(self, tmp_path):
+        """Smoke test through the CLI; the other tests share one executor run."""
         output = tmp_path / "output.xlsx"
         result = runner.invoke(
             app,
@@ -294,25 +239,13 @@ class TestTeamRoster:
             ],
         )
         assert result.exit_code == 0, result.output
-        xls = pd.ExcelFile(output)
-        assert xls.sheet_names == ["Roster"]
+        assert _sheet_names(output) == ["Roster"]
 
-    def test_first_and_last_names_anonymized_separately(self, tmp_path):
-        output = tmp_path / "output.xlsx"
-        runner.invoke(
-            app,
-            [
-                "process",
-                str(TEAM_ROSTER),
-                str(output),
-                "--config",
-                str(TEAM_CONFIG),
-                "--seed",
-                "42",
-            ],
-        )
-        original_df = pd.read_excel(TEAM_ROSTER, sheet_name="Roster")
-        output_df = pd.read_excel(output, sheet_name="Roster")
+    def test_first_and_last_names_anonymized_separately(
+        self, roster_sheets, original_roster_sheets
+    ):
+        original_df = original_roster_sheets["Roster"]
+        output_df = roster_sheets["Roster"]
 
         # The output columns must not be identical to the originals row-by-row.
         # (Common first/last names can collide between Faker output and the fixture,
@@ -325,144 +258,53 @@ class TestTeamRoster:
             output_df["Last Name"]
         ), "Last Name column was not changed by anonymization"
 
-    def test_null_phones_remain_null(self, tmp_path):
-        output = tmp_path / "output.xlsx"
-        runner.invoke(
-            app,
-            [
-                "process",
-                str(TEAM_ROSTER),
-                str(output),
-                "--config",
-                str(TEAM_CONFIG),
-                "--seed",
-                "42",
-            ],
-        )
-        original_df = pd.read_excel(TEAM_ROSTER, sheet_name="Roster")
-        output_df = pd.read_excel(output, sheet_name="Roster")
+    def test_null_phones_remain_null(self, roster_sheets, original_roster_sheets):
+        original_df = original_roster_sheets["Roster"]
+        output_df = roster_sheets["Roster"]
         original_nulls = original_df["Phone"].isna()
         output_nulls = output_df["Phone"].isna()
         pd.testing.assert_series_equal(original_nulls, output_nulls, check_names=False)
 
-    def test_annual_bonus_derived_from_anonymized_salary(self, tmp_path):
+    def test_annual_bonus_derived_from_anonymized_salary(self, roster_sheets):
         """Annual Bonus = Base Salary * Bonus % / 100 after anonymization."""
-        output = tmp_path / "output.xlsx"
-        runner.invoke(
-            app,
-            [
-                "process",
-                str(TEAM_ROSTER),
-                str(output),
-                "--config",
-                str(TEAM_CONFIG),
-                "--seed",
-                "42",
-            ],
-        )
-        df = pd.read_excel(output, sheet_name="Roster")
+        df = roster_sheets["Roster"]
         expected = (df["Base Salary"] * df["Bonus %"] / 100).round(0)
         pd.testing.assert_series_equal(
             df["Annual Bonus"].round(0), expected, check_names=False, check_dtype=False
         )
 
-    def test_employee_ids_preserved(self, tmp_path):
+    def test_employee_ids_preserved(self, roster_sheets, original_roster_sheets):
         """Employee ID is a preserve_column -- must not change."""
-        output = tmp_path / "output.xlsx"
-        runner.invoke(
-            app,
-            [
-                "process",
-                str(TEAM_ROSTER),
-                str(output),
-                "--config",
-                str(TEAM_CONFIG),
-                "--seed",
-                "42",
-            ],
-        )
-        original_df = pd.read_excel(TEAM_ROSTER, sheet_name="Roster")
-        output_df = pd.read_excel(output, sheet_name="Roster")
+        original_df = original_roster_sheets["Roster"]
+        output_df = roster_sheets["Roster"]
         pd.testing.assert_series_equal(
             original_df["Employee ID"], output_df["Employee ID"]
         )
 
-    def test_departments_preserved(self, tmp_path):
-        original_df = pd.read_excel(TEAM_ROSTER, sheet_name="Roster")
-        output = tmp_path / "output.xlsx"
-        runner.invoke(
-            app,
-            [
-                "process",
-                str(TEAM_ROSTER),
-                str(output),
-                "--config",
-                str(TEAM_CONFIG),
-                "--seed",
-                "42",
-            ],
-        )
-        output_df = pd.read_excel(output, sheet_name="Roster")
+    def test_departments_preserved(self, roster_sheets, original_roster_sheets):
+        original_df = original_roster_sheets["Roster"]
+        output_df = roster_sheets["Roster"]
         pd.testing.assert_series_equal(
             original_df["Department"], output_df["Department"]
         )
 
-    def test_salaries_changed_but_in_range(self, tmp_path):
-        output = tmp_path / "output.xlsx"
-        runner.invoke(
-            app,
-            [
-                "process",
-                str(TEAM_ROSTER),
-                str(output),
-                "--config",
-                str(TEAM_CONFIG),
-                "--seed",
-                "42",
-            ],
-        )
-        original_df = pd.read_excel(TEAM_ROSTER, sheet_name="Roster")
-        output_df = pd.read_excel(output, sheet_name="Roster")
+    def test_salaries_changed_but_in_range(self, roster_sheets, original_roster_sheets):
+        original_df = original_roster_sheets["Roster"]
+        output_df = roster_sheets["Roster"]
         # Values changed
         assert not original_df["Base Salary"].equals(output_df["Base Salary"])
         # But within 15% variance bounds
         assert all(output_df["Base Salary"] >= original_df["Base Salary"] * 0.85)
         assert all(output_df["Base Salary"] <= original_df["Base Salary"] * 1.15)
 
-    def test_hire_dates_preserved(self, tmp_path):
-        output = tmp_path / "output.xlsx"
-        runner.invoke(
-            app,
-            [
-                "process",
-                str(TEAM_ROSTER),
-                str(output),
-                "--config",
-                str(TEAM_CONFIG),
-                "--seed",
-                "42",
-            ],
-        )
-        original_df = pd.read_excel(TEAM_ROSTER, sheet_name="Roster")
-        output_df = pd.read_excel(output, sheet_name="Roster")
+    def test_hire_dates_preserved(self, roster_sheets, original_roster_sheets):
+        original_df = original_roster_sheets["Roster"]
+        output_df = roster_sheets["Roster"]
         pd.testing.assert_series_equal(original_df["Hire Date"], output_df["Hire Date"])
 
-    def test_locations_anonymized(self, tmp_path):
-        output = tmp_path / "output.xlsx"
-        runner.invoke(
-            app,
-            [
-                "process",
-                str(TEAM_ROSTER),
-                str(output),
-                "--config",
-                str(TEAM_CONFIG),
-                "--seed",
-                "42",
-            ],
-        )
-        original_df = pd.read_excel(TEAM_ROSTER, sheet_name="Roster")
-        output_df = pd.read_excel(output, sheet_name="Roster")
+    def test_locations_anonymized(self, roster_sheets, original_roster_sheets):
+        original_df = original_roster_sheets["Roster"]
+        output_df = roster_sheets["Roster"]
         original_locs = set(original_df["Location"])
         output_locs = set(output_df["Location"])
         assert not original_locs.intersection(output_locs)
@@ -471,27 +313,57 @@ class TestTeamRoster:
 # --- Multi-analyzer tests ---
 
 
-class TestMultiAnalyzer:
-    def test_analyze_two_files_returns_prompt(self):
-        from sheetmask.multi_analyzer import analyze_multiple_files
+@pytest.fixture(scope="session")
+def multi_file_prompt():
+    from sheetmask.multi_analyzer import analyze_multiple_files
+
+    return analyze_multiple_files([REVENUE_REPORT, TEAM_ROSTER])
+
 
-        result = analyze_multiple_files([REVENUE_REPORT, TEAM_ROSTER])
+@pytest.fixture(scope="session")
+def revenue_schema_comparison():
+    from sheetmask.multi_analyzer import compare_schemas
+
+    # Same file twice guarantees stable columns
+    return compare_schemas([REVENUE_REPORT, REVENUE_REPORT])
+
+
+@pytest.fixture(scope="session")
+def revenue_data_patterns():
+    from sheetmask.multi_analyzer import compare_data_patterns
+
+    return compare_data_patterns([REVENUE_REPORT, REVENUE_REPORT])
+
+
+@pytest.mark.xlsx
+class TestMultiAnalyzer:
+    def test_analyze_two_files_returns_prompt(self, multi_file_prompt):
+        result = multi_file_prompt
         assert isinstance(result, str)
         assert "Multi-Month Excel Analysis" in result
         assert "Schema Stability Report" in result
 
-    def test_stable_columns_detected(self):
-        from sheetmask.multi_analyzer import compare_schemas
+    def test_each_file_read_once(self, mocker):
+        from sheetmask import multi_analyzer
+
+        spy = mocker.spy(multi_analyzer, "read_sheet")
+        multi_analyzer.analyze_multiple_files([REVENUE_REPORT, TEAM_ROSTER])
+        assert spy.call_count == 2
 
-        # Revenue report has consistent sheets; use same file twice to guarantee stable columns
-        result = compare_schemas([REVENUE_REPORT, REVENUE_REPORT])
+    def test_stable_columns_detected(self, revenue_schema_comparison):
+        result = revenue_schema_comparison
         assert len(result["stable_columns"]) > 0
         assert result["total_files"] == 2
 
-    def test_data_patterns_computed(self):
-        from sheetmask.multi_analyzer import compare_data_patterns
+    def test_schema_comparison_reads_sample_only(self, mocker):
+        from sheetmask import multi_analyzer
 
-        result = compare_data_patterns([REVENUE_REPORT, REVENUE_REPORT])
+        spy = mocker.spy(multi_analyzer, "read_excel")
+        multi_analyzer.compare_schemas([REVENUE_REPORT])
+        assert spy.call_args.kwargs["nrows"] == multi_analyzer.SCHEMA_SAMPLE_ROWS
+
+    def test_data_patterns_computed(self, revenue_data_patterns):
+        result = revenue_data_patterns
         assert len(result) > 0
         for col, stats in result.items():
             assert "null_pct_range" in stats
@@ -562,14 +434,8 @@ class TestDateFormats:
 
 
 class TestExecutor:
-    def test_anonymize_file_returns_stats(self, tmp_path):
-        import importlib.util
-
-        spec = importlib.util.spec_from_file_location("cfg", TEAM_CONFIG)
-        mod = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(mod)
-
-        executor = AnonymizationExecutor(mod.config, seed=42)
+    def test_anonymize_file_returns_stats(self, tmp_path, team_config):
+        executor = AnonymizationExecutor(team_config, seed=42)
         output = tmp_path / "out.xlsx"
         stats = executor.anonymize_file(TEAM_ROSTER, output, auto_suffix=False)
 
@@ -577,15 +443,8 @@ class TestExecutor:
         assert stats["total_rows"] == 15
         assert stats["entity_mappings"]["total_mappings"] > 0
 
-    def test_export_mapping_report(self, tmp_path):
-        import json
-        import importlib.util
-
-        spec = importlib.util.spec_from_file_location("cfg", TEAM_CONFIG)
-        mod = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(mod)
-
-        executor = AnonymizationExecutor(mod.config, seed=42)
+    def test_export_mapping_report(self, tmp_path, team_config):
+        executor = AnonymizationExecutor(team_config, seed=42)
         output = tmp_path / "out.xlsx"
         executor.anonymize_file(TEAM_ROSTER, output, auto_suffix=False)
 
@@ -597,3 +456,145 @@ class TestExecutor:
         assert "entity_types" in data
         assert "total_mappings" in data
         assert data["total_mappings"] > 0
+
+    def test_entity_column_keeps_blanks_and_maps_repeats(self):
+        config = {"entity_columns": {"Client": "ORGANIZATION"}}
+        executor = AnonymizationExecutor(config, seed=42)
+        df = pd.DataFrame({"Client": ["Acme", None, "", "Globex", "Acme"]})
+
+        result = executor._anonymize_sheet(df, "Sheet1")["Client"]
+
+        assert pd.isna(result.iloc[1])
+        assert result.iloc[2] == ""
+        assert result.iloc[0] == result.iloc[4]
+        assert result.iloc[0] not in ("Acme", "Globex")
+        assert result.iloc[0] != result.iloc[3]
+        assert executor.entity_mapper.mappings["ORGANIZATION"]["Acme"] == result.iloc[0]
+
+    def test_entity_column_keys_mixed_types_by_str(self):
+        config = {"entity_columns": {"Code": "ORGANIZATION"}}
+        executor = AnonymizationExecutor(config, seed=42)
+        df = pd.DataFrame({"Code": pd.Series([True, 1, 1.0, "1"], dtype=object)})
+
+        result = executor._anonymize_sheet(df, "Sheet1")["Code"]
+
+        # Same keys as str(value): True, 1 and 1.0 differ; 1 and "1" match
+        assert len({result.iloc[0], result.iloc[1], result.iloc[2]}) == 3
+        assert result.iloc[1] == result.iloc[3]
+        assert executor.entity_mapper.mappings["ORGANIZATION"].keys() == {
+            "True",
+            "1",
+            "1.0",
+        }
+
+    def test_entity_column_keys_datetimes_by_str(self):
+        config = {"entity_columns": {"Start": "PERSON"}}
+        executor = AnonymizationExecutor(config, seed=42)
+        df = pd.DataFrame({"Start": pd.to_datetime(["2024-01-01", None])})
+
+        result = executor._anonymize_sheet(df, "Sheet1")["Start"]
+
+        assert pd.isna(result.iloc[1])
+        assert executor.entity_mapper.mappings["PERSON"].keys() == {
+            str(df["Start"].iloc[0])
+        }
+
+    def test_entity_column_accepts_categorical(self):
+        config = {"entity_columns": {"Client": "ORGANIZATION"}}
+        executor = AnonymizationExecutor(config, seed=42)
+        df = pd.DataFrame(
+            {"Client": pd.Series(["Acme", None, "Globex", "Acme"], dtype="category")}
+        )
+
+        result = executor._anonymize_sheet(df, "Sheet1")["Client"]
+
+        assert pd.isna(result.iloc[1])
+        assert result.iloc[0] == result.iloc[3]
+        assert result.iloc[0] not in ("Acme", "Globex")
+
+    def test_relationship_rules_see_recomputed_columns(self):
+        config = {
+            "numeric_rules": {
+                "Revenue": PercentageVarianceRule(variance_pct=0.2),
+                "Cost": PercentageVarianceRule(variance_pct=0.2),
+                "GM": PreserveRelationshipRule(
+                    formula="context['Revenue'] - context['Cost']",
+                    dependent_columns=["Revenue", "Cost"],
+                ),
+                "GM%": PreserveRelationshipRule(
+                    formula="context['GM'] / context['Revenue'] * 100",
+                    dependent_columns=["GM", "Revenue"],
+                ),
+            }
+        }
+        executor = AnonymizationExecutor(config, seed=42)
+        df = pd.DataFrame(
+            {
+                "Revenue": [1000.0, 2000.0],
+                "Cost": [400.0, 500.0],
+                "GM": [600.0, 1500.0],
+                "GM%": [60.0, 75.0],
+            }
+        )
+
+        result = executor._anonymize_sheet(df, "Sheet1")
+
+        pd.testing.assert_series_equal(
+            result["GM"],
+            (result["Revenue"] - result["Cost"]).round(2),
+            check_names=False,
+        )
+        pd.testing.assert_series_equal(
+            result["GM%"],
+            (result["GM"] / result["Revenue"] * 100).round(2),
+            check_names=False,
+        )
+
+    def test_auto_suffix_added_once(self, tmp_path):
+        executor = AnonymizationExecutor({}, seed=42)
+
+        stats = executor.anonymize_file(TEAM_ROSTER, tmp_path / "roster.xlsx")
+        assert Path(stats["output_file"]).name == "roster (ANONYMIZED).xlsx"
+
+        stats = executor.anonymize_file(TEAM_ROSTER, stats["output_file"])
+        assert Path(stats["output_file"]).name == "roster (ANONYMIZED).xlsx"
+
+    def test_anonymize_sheet_leaves_input_untouched(self):
+        config = {
+            "entity_columns": {"Client": "ORGANIZATION"},
+            "numeric_rules": {
+                "Revenue": PercentageVarianceRule(variance_pct=0.2),
+                "Double": PreserveRelationshipRule(
+                    formula="context['Revenue'] * 2",
+                    dependent_columns=["Revenue"],
+                ),
+            },
+        }
+        executor = AnonymizationExecutor(config, seed=42)
+        df = pd.DataFrame(
+            {"Client": ["Acme", "Globex"], "Revenue": [100.0, 200.0], "Double": [0, 0]}
+        )
+        original = df.copy()
+
+        result = executor._anonymize_sheet(df, "Sheet1")
+
+        pd.testing.assert_frame_equal(df, original)
+        assert not result["Revenue"].equals(original["Revenue"])
+
+    def test_mapping_report_same_with_or_without_orjson(self, tmp_path, monkeypatch):
+        from sheetmask import executor as executor_module
+
+        pytest.importorskip("orjson")
+        executor = AnonymizationExecutor({}, seed=42)
+        executor.entity_mapper.get_or_create("PERSON", "Zoë")
+        executor.entity_mapper.get_or_create("ORGANIZATION", "Acme")
+
+        reports = []
+        for use_orjson in (False, True):
+            monkeypatch.setattr(executor_module, "ORJSON", use_orjson)
+            path = tmp_path / f"mappings_{use_orjson}.json"
+            executor.export_mapping_report(path)
+            reports.append(json.loads(path.read_text(encoding="utf-8")))
+
+        assert reports[0] == reports[1]
+        assert reports[0]["mappings"]["PERSON"].keys() == {"Zoë"}
@@ -1,13 +1,18 @@
+import pickle
 import random
-
+import numpy as np
 import pandas as pd
 import pytest
-from sheetmask.rules import PercentageVarianceRule, PreserveRelationshipRule
+from sheetmask import rules
+from sheetmask.rules import (
+    PercentageVarianceRule,
+    PreserveRelationshipRule,
+    apply_variance_rules,
+)
 
 
 def test_percentage_variance_changes_values():
-    random.seed(0)
-    rule = PercentageVarianceRule(variance_pct=0.3)
+    rule = PercentageVarianceRule(variance_pct=0.3, rng=np.random.default_rng(0))
     series = pd.Series([100.0, 200.0, 300.0])
     result = rule.apply(series, {})
     # Each value should shift by at least 1% (30% variance applied)
@@ -36,6 +41,25 @@ def test_percentage_variance_stays_within_range():
     assert all(result <= 1100.0)
 
 
+def test_percentage_variance_large_series_draws_once_per_value():
+    n = 1_000_000
+    values = np.linspace(1.0, 1000.0, n)
+    values[::10] = 0.0
+    values[5::10] = np.nan
+    series = pd.Series(values)
+
+    result = PercentageVarianceRule(
+        variance_pct=0.2, rng=np.random.default_rng(3)
+    ).apply(series, {})
+
+    # One vectorized draw over the non-null, non-zero values
+    mask = ~np.isnan(values) & (values != 0)
+    noise = np.random.default_rng(3).uniform(-0.2, 0.2, size=mask.sum())
+    expected = values.copy()
+    expected[mask] = np.round(values[mask] + values[mask] * noise, 2)
+    np.testing.assert_array_equal(result.to_numpy(), expected)
+
+
 def test_preserve_relationship_recomputes_from_context():
     rule = PreserveRelationshipRule(
         formula="context['Revenue'] - context['Cost']",
@@ -60,15 +84,102 @@ def test_preserve_relationship_raises_on_missing_column():
 
 
 def test_percentage_variance_is_reproducible_with_seed():
-    import random as stdlib_random
-
-    rng = stdlib_random.Random(42)
-    rule = PercentageVarianceRule(variance_pct=0.3, rng=rng)
+    rule = PercentageVarianceRule(variance_pct=0.3, rng=np.random.default_rng(42))
     series = pd.Series([100.0, 200.0, 300.0])
     result1 = rule.apply(series, {})
 
-    rng2 = stdlib_random.Random(42)
-    rule2 = PercentageVarianceRule(variance_pct=0.3, rng=rng2)
+    rule2 = PercentageVarianceRule(variance_pct=0.3, rng=np.random.default_rng(42))
     result2 = rule2.apply(series, {})
 
     pd.testing.assert_series_equal(result1, result2)
+
+
+def test_percentage_variance_accepts_stdlib_random():
+    series = pd.Series([100.0, 200.0, 0.0, None])
+    first = PercentageVarianceRule(variance_pct=0.3, rng=random.Random(42))
+    second = PercentageVarianceRule(variance_pct=0.3, rng=random.Random(42))
+    assert isinstance(first.rng, np.random.Generator)
+    result = first.apply(series, {})
+    pd.testing.assert_series_equal(result, second.apply(series, {}))
+    assert result[2] == 0.0
+    assert pd.isna(result[3])
+
+
+def test_percentage_variance_handles_integer_series():
+    rule = PercentageVarianceRule(variance_pct=0.1, rng=np.random.default_rng(0))
+    series = pd.Series([0, 1000, 2000], index=[5, 6, 7], name="Headcount")
+    result = rule.apply(series, {})
+    assert result.name == "Headcount"
+    assert list(result.index) == [5, 6, 7]
+    assert result.iloc[0] == 0.0
+    assert 900.0 <= result.iloc[1] <= 1100.0
+
+
+def test_preserve_relationship_rejects_invalid_formula_on_creation():
+    with pytest.raises(SyntaxError):
+        PreserveRelationshipRule(
+            formula="context['Revenue'] -",
+            dependent_columns=["Revenue"],
+        )
+
+
+def test_preserve_relationship_rejects_undeclared_columns():
+    with pytest.raises(ValueError, match="Cost"):
+        PreserveRelationshipRule(
+            formula="context['Revenue'] - context['Cost']",
+            dependent_columns=["Revenue"],
+        )
+
+
+def test_preserve_relationship_compiles_formula_once(monkeypatch):
+    calls = []
+
+    def counting_compile(*args, **kwargs):
+        calls.append(args)
+        return compile(*args, **kwargs)
+
+    monkeypatch.setattr(rules, "compile", counting_compile, raising=False)
+    rule = PreserveRelationshipRule(
+        formula="context['Revenue'] * 2", dependent_columns=["Revenue"]
+    )
+    context = {"Revenue": pd.Series([1.0, 2.0])}
+    for _ in range(10_000):
+        rule.apply(context["Revenue"], context)
+    assert len(calls) == 1
+
+
+def test_preserve_relationship_survives_pickling():
+    rule = PreserveRelationshipRule(
+        formula="context['Revenue'] * 2", dependent_columns=["Revenue"]
+    )
+    restored = pickle.loads(pickle.dumps(rule))
+    assert restored == rule
+    context = {"Revenue": pd.Series([1.5, 2.0])}
+    pd.testing.assert_series_equal(
+        restored.apply(pd.Series([0.0, 0.0]), context),
+        rule.apply(pd.Series([0.0, 0.0]), context),
+    )
+
+
+def test_apply_variance_rules_matches_per_column_rules():
+    df = pd.DataFrame(
+        {
+            "Revenue": [100.0, None, 0.0, 250.0],
+            "Cost": [10, 20, 30, 40],
+            "Name": ["a", "b", "c", "d"],
+        }
+    )
+    variance_rules = {
+        "Revenue": PercentageVarianceRule(variance_pct=0.3),
+        "Cost": PercentageVarianceRule(variance_pct=0.05),
+    }
+
+    rng = np.random.default_rng(3)
+    expected = df.copy()
+    for col, rule in variance_rules.items():
+        expected[col] = PercentageVarianceRule(rule.variance_pct, rng=rng).apply(
+            df[col], {}
+        )
+
+    result = apply_variance_rules(df, variance_rules, np.random.default_rng(3))
+    pd.testing.assert_frame_equal(result, expected)